@@ -0,0 +1,306 @@
+"""
+Cluster mode: headless peers push their stats over UDP to a node with a display.
+"""
+import socket
+import struct
+import time
+
+DEFAULT_CLUSTER_PORT = 7391
+
+# magic, version, service flags, sequence, cpu %, ram %, temperature (0.1 C), hostname length
+PACKET_HEADER = struct.Struct("!2sBBIBBhB")
+PACKET_MAGIC = b"RO"
+PACKET_VERSION = 1
+MAX_HOSTNAME = 64
+MAX_PACKET = PACKET_HEADER.size + MAX_HOSTNAME
+
+SERVICE_DOCKER = 0x01
+SERVICE_CEPH = 0x02
+
+SEQUENCE_MODULUS = 1 << 32
+# Packets this far behind the last sequence are treated as a restarted peer, not reordering
+REORDER_WINDOW = 64
+# Minimum seconds between DNS lookups of the display node after a failure
+RESOLVE_RETRY_INTERVAL = 60.0
+
+def parse_address(value, default_host="0.0.0.0", default_port=DEFAULT_CLUSTER_PORT):
+    """
+    Parse "host:port", "host" or "port" into an address tuple.
+
+    Args:
+        value: Address string from the command line
+        default_host: Host used when only a port is given
+        default_port: Port used when only a host is given
+
+    Returns:
+        tuple: (host, port)
+    """
+    host, sep, port = value.rpartition(":")
+    if sep:
+        return (host or default_host, int(port))
+    if value.isdigit():
+        return (default_host, int(value))
+    return (value, default_port)
+
+class NodeStats:
+    """
+    Latest stats reported by one peer node.
+    """
+    __slots__ = ("hostname", "sequence", "cpu", "ram", "temp", "docker", "ceph", "last_seen")
+
+    def __init__(self):
+        self.hostname = ""
+        self.sequence = 0
+        self.cpu = 0
+        self.ram = 0
+        self.temp = 0.0
+        self.docker = False
+        self.ceph = False
+        self.last_seen = None  # None marks a free table slot
+
+def stats_from_snapshot(snapshot):
+    """
+    Extract the values sent to the display node from a DisplayManager-style snapshot.
+
+    Returns:
+        tuple: (cpu %, ram %, temperature C, docker active, ceph active)
+    """
+    widgets = snapshot["widgets"]
+    cpu = widgets.get("CPUWidget") or widgets.get("CPUCoresWidget") or {}
+    return (
+        cpu.get("value", 0),
+        widgets.get("RAMWidget", {}).get("value", 0),
+        widgets.get("TempWidget", {}).get("value", 0.0),
+        widgets.get("DockerWidget", {}).get("active", False),
+        widgets.get("CephWidget", {}).get("active", False),
+    )
+
+def encode_stats(hostname, sequence, cpu, ram, temp, docker=False, ceph=False):
+    """
+    Build a stats datagram.
+
+    Returns:
+        bytes: Packet of at most MAX_PACKET bytes
+    """
+    name = hostname.encode()[:MAX_HOSTNAME]
+    flags = (SERVICE_DOCKER if docker else 0) | (SERVICE_CEPH if ceph else 0)
+    header = PACKET_HEADER.pack(
+        PACKET_MAGIC, PACKET_VERSION, flags, sequence % SEQUENCE_MODULUS,
+        min(100, max(0, int(cpu + 0.5))),
+        min(100, max(0, int(ram + 0.5))),
+        min(32767, max(-32768, int(round(temp * 10)))),
+        len(name),
+    )
+    return header + name
+
+def decode_stats(data):
+    """
+    Parse a stats datagram.
+
+    Returns:
+        tuple: (hostname, sequence, cpu, ram, temp, docker, ceph), or None if malformed
+    """
+    if len(data) < PACKET_HEADER.size:
+        return None
+    magic, version, flags, sequence, cpu, ram, temp, name_length = PACKET_HEADER.unpack_from(data)
+    if magic != PACKET_MAGIC or version != PACKET_VERSION:
+        return None
+    name = bytes(data[PACKET_HEADER.size:PACKET_HEADER.size + name_length])
+    if len(name) != name_length or not name:
+        return None
+    return (
+        name.decode(errors="replace"), sequence, cpu, ram, temp / 10.0,
+        bool(flags & SERVICE_DOCKER), bool(flags & SERVICE_CEPH),
+    )
+
+class PushAgent:
+    """
+    Sends this node's stats to the display node, one datagram per update.
+    Every datagram carries the full state, so lost packets only delay the view.
+    """
+    def __init__(self, address, hostname=None, clock=time.monotonic):
+        """
+        Initialize the agent.
+
+        The display node's name is resolved once here; it is only looked up
+        again after a lookup or send fails, at most every RESOLVE_RETRY_INTERVAL.
+
+        Args:
+            address: (host, port) of the display node
+            hostname: Name reported for this node (default: system hostname)
+            clock: Monotonic time source in seconds
+        """
+        self.address = address
+        self.hostname = hostname or socket.gethostname()
+        self.clock = clock
+        self.sequence = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self._target = None
+        self._resolved_at = None
+        self._next_resolve = None  # Time of the next lookup, None while the address is good
+        self._resolve()
+
+    def _resolve(self):
+        """Look up the display node address, keeping the previous one if the lookup fails."""
+        host, port = self.address
+        self._resolved_at = self.clock()
+        try:
+            infos = socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_DGRAM)
+        except OSError:
+            self._next_resolve = self._resolved_at + RESOLVE_RETRY_INTERVAL
+            return
+        self._target = infos[0][4]
+        self._next_resolve = None
+
+    def send(self, snapshot):
+        """
+        Send the stats from a snapshot; usable as a DisplayManager listener.
+
+        Args:
+            snapshot: Dict with a "widgets" mapping as from DisplayManager.snapshot()
+        """
+        self.sequence = (self.sequence + 1) % SEQUENCE_MODULUS
+        if self._next_resolve is not None and self.clock() >= self._next_resolve:
+            self._resolve()
+        if self._target is None:
+            return
+        packet = encode_stats(self.hostname, self.sequence, *stats_from_snapshot(snapshot))
+        try:
+            self.sock.sendto(packet, self._target)
+        except OSError:
+            # Best effort: the display node may be down or unreachable. Look its
+            # name up again in case its address changed.
+            if self._next_resolve is None:
+                self._next_resolve = self._resolved_at + RESOLVE_RETRY_INTERVAL
+
+    def close(self):
+        """Close the socket."""
+        self.sock.close()
+
+class ClusterTable:
+    """
+    Fixed-size table of peer stats fed by non-blocking UDP receives.
+    Entries expire when a peer has not been heard from for `ttl` seconds.
+    """
+    def __init__(self, capacity=16, ttl=10.0, clock=time.monotonic):
+        """
+        Initialize the table.
+
+        Args:
+            capacity: Maximum number of peers tracked
+            ttl: Seconds without a packet before a peer is dropped
+            clock: Monotonic time source in seconds
+        """
+        self.capacity = capacity
+        self.ttl = ttl
+        self.clock = clock
+        self.slots = [NodeStats() for _ in range(capacity)]
+        self.sock = None
+        self._buf = bytearray(MAX_PACKET)
+
+    def bind(self, address):
+        """
+        Start listening for peer datagrams.
+
+        Args:
+            address: (host, port) to bind
+        """
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(address)
+        self.sock.setblocking(False)
+
+    def poll(self, max_packets=256):
+        """
+        Drain pending datagrams without blocking and expire silent peers.
+
+        Args:
+            max_packets: Upper bound on datagrams handled per call
+
+        Returns:
+            int: Number of valid datagrams applied
+        """
+        now = self.clock()
+        applied = 0
+        if self.sock is not None:
+            for _ in range(max_packets):
+                try:
+                    size = self.sock.recv_into(self._buf)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    # e.g. ICMP errors reported on the socket; keep receiving
+                    continue
+                stats = decode_stats(memoryview(self._buf)[:size])
+                if stats is not None and self.apply(stats, now):
+                    applied += 1
+        self.expire(now)
+        return applied
+
+    def apply(self, stats, now=None):
+        """
+        Store decoded stats in the table.
+
+        Args:
+            stats: Tuple as returned by decode_stats()
+            now: Current clock value (default: read the clock)
+
+        Returns:
+            bool: False if the packet was a duplicate or arrived out of order
+        """
+        if now is None:
+            now = self.clock()
+        hostname, sequence = stats[0], stats[1]
+
+        slot = None
+        free = None
+        oldest = None
+        for candidate in self.slots:
+            if candidate.last_seen is None or now - candidate.last_seen > self.ttl:
+                if free is None:
+                    free = candidate
+            elif candidate.hostname == hostname:
+                slot = candidate
+                break
+            elif oldest is None or candidate.last_seen < oldest.last_seen:
+                oldest = candidate
+
+        if slot is not None:
+            behind = (slot.sequence - sequence) % SEQUENCE_MODULUS
+            # Drop duplicates and late packets, but accept a large jump back (peer restarted)
+            if behind < REORDER_WINDOW:
+                return False
+        else:
+            # Prefer a free slot; with a full table replace the peer heard from longest ago
+            slot = free or oldest
+
+        slot.hostname = hostname
+        (slot.sequence, slot.cpu, slot.ram, slot.temp, slot.docker, slot.ceph) = stats[1:]
+        slot.last_seen = now
+        return True
+
+    def expire(self, now=None):
+        """Free the slots of peers that have been silent for longer than the TTL."""
+        if now is None:
+            now = self.clock()
+        for slot in self.slots:
+            if slot.last_seen is not None and now - slot.last_seen > self.ttl:
+                slot.last_seen = None
+
+    def nodes(self):
+        """
+        Return the live peers.
+
+        Returns:
+            list: NodeStats entries sorted by hostname
+        """
+        live = [slot for slot in self.slots if slot.last_seen is not None]
+        live.sort(key=lambda slot: slot.hostname)
+        return live
+
+    def close(self):
+        """Close the socket."""
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
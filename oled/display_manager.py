@@ -1,15 +1,21 @@
 """
 DisplayManager: Handles OLED initialization, widget layout, and screen refresh.
 """
+import time
 from luma.core.interface.serial import i2c
 from luma.oled.device import ssd1306
 from PIL import Image, ImageDraw
+from .profiler import WidgetTiming
+
+# Blank gap that ResourceWidget and TextWidget leave after themselves in render()
+RESOURCE_TRAILING_GAP = 5
+TEXT_TRAILING_GAP = 2
 
 class DisplayManager:
     """
     Manages the OLED display and renders widgets in a layout matching the mockup.
     """
-    def __init__(self, width=128, height=32, i2c_port=1, i2c_address=0x3C):
+    def __init__(self, width=128, height=32, i2c_port=1, i2c_address=0x3C, device=None, clock=time.time):
         """
         Initialize the display manager and connect to the OLED.
         
@@ -18,33 +24,126 @@ class DisplayManager:
             height: Display height in pixels (default: 32)
             i2c_port: I2C bus number (default: 1)
             i2c_address: I2C address of the OLED (default: 0x3C)
+            device: Pre-built luma device, e.g. luma.core.device.dummy for headless use
+                (default: SSD1306 on the given I2C bus)
+            clock: Wall-clock time source used to timestamp snapshots
         """
         self.width = width
         self.height = height
+        self.clock = clock
         
-        # Initialize the OLED display using standard luma.oled approach
-        self.serial = i2c(port=i2c_port, address=i2c_address)
-        # Create the device with 180 degree rotation to fix upside-down display
-        self.device = ssd1306(self.serial, width=width, height=height, rotate=2)  # rotate=2 is 180 degrees
+        if device is not None:
+            self.serial = None
+            self.device = device
+        else:
+            # Initialize the OLED display using standard luma.oled approach
+            self.serial = i2c(port=i2c_port, address=i2c_address)
+            # Create the device with 180 degree rotation to fix upside-down display
+            self.device = ssd1306(self.serial, width=width, height=height, rotate=2)  # rotate=2 is 180 degrees
         
         # Widget collections by row
         self.top_row_widgets = []    # Resource and service widgets
         self.bottom_row_widgets = [] # Text widgets
 
-    def add_resource_widget(self, widget):
+        # All widgets by snapshot name, in the order they were added
+        self.widgets = {}
+        # Callbacks receiving a snapshot after every update
+        self.listeners = []
+
+        # Right edge reached by each row in the last render, and the rows that
+        # ran into the service icons or off the display
+        self.row_extents = {"top": 0, "bottom": 0}
+        self.overflow = []
+
+        # Per-widget update/render timings, and what the loop is doing right now
+        # ("update", "listeners", "render" or None between ticks) for the profiler
+        self.timings = {}
+        self.current_phase = None
+        self.current_widget = None
+
+    def _register(self, widget, name):
+        """
+        Register a widget under a unique snapshot name.
+        Defaults to the class name, suffixed with #2, #3... for duplicates.
+        """
+        name = name or type(widget).__name__
+        unique_name = name
+        count = 1
+        while unique_name in self.widgets:
+            count += 1
+            unique_name = f"{name}#{count}"
+        self.widgets[unique_name] = widget
+        self.timings[unique_name] = WidgetTiming()
+        widget.name = unique_name
+
+    def add_resource_widget(self, widget, name=None):
         """Add a resource widget to the top row."""
+        self._register(widget, name)
         self.top_row_widgets.append(("resource", widget))
 
-    def add_service_widget(self, widget):
+    def add_service_widget(self, widget, name=None):
         """Add a service widget to the top row."""
+        self._register(widget, name)
         self.top_row_widgets.append(("service", widget))
 
-    def add_text_widget(self, widget):
+    def add_text_widget(self, widget, name=None):
         """Add a text widget to the bottom row."""
+        self._register(widget, name)
         self.bottom_row_widgets.append(widget)
 
+    def add_listener(self, callback):
+        """
+        Register a callback that receives a snapshot after every update.
+
+        Args:
+            callback: Callable taking the dict returned by snapshot()
+        """
+        self.listeners.append(callback)
+
+    def snapshot(self):
+        """
+        Collect the latest values of all widgets.
+
+        Returns:
+            dict: {"time": epoch seconds, "widgets": {name: widget state}}
+        """
+        return {
+            "time": self.clock(),
+            "widgets": {name: widget.get_state() for name, widget in self.widgets.items()},
+        }
+
+    def _timing(self, widget):
+        """
+        Return the timing entry of a widget, registering widgets that were
+        appended to the row lists directly instead of through add_*_widget().
+        """
+        timing = self.timings.get(widget.name)
+        if timing is None or self.widgets.get(widget.name) is not widget:
+            self._register(widget, None)
+            timing = self.timings[widget.name]
+        return timing
+
+    def _update_widget(self, widget):
+        """Update one widget, recording its timing."""
+        timing = self._timing(widget)
+        self.current_widget = widget.name
+        started = time.perf_counter()
+        widget.update()
+        timing.add_update(time.perf_counter() - started)
+
+    def _render_widget(self, widget, draw, x, y):
+        """Render one widget, recording its timing."""
+        timing = self._timing(widget)
+        self.current_widget = widget.name
+        started = time.perf_counter()
+        position = widget.render(draw, x, y, self.width)
+        timing.add_render(time.perf_counter() - started)
+        return position
+
     def render(self):
         """Create and render the complete display layout."""
+        self.current_phase = "render"
+
         # Create a new blank image
         image = Image.new("1", (self.width, self.height))
         draw = ImageDraw.Draw(image)
@@ -57,7 +156,8 @@ class DisplayManager:
         x = 0
         for widget_type, widget in self.top_row_widgets:
             if widget_type == "resource":
-                x, _ = widget.render(draw, x, top_row_y, self.width)
+                x, _ = self._render_widget(widget, draw, x, top_row_y)
+        top_row_end = x
         
         # Render service widgets from right to left, spaced horizontally
         # Align them to the right side of the display
@@ -69,10 +169,13 @@ class DisplayManager:
         service_spacing = 20  # Each icon gets 20px of space
         
         # Start from right edge with proper spacing
+        services_left = self.width
         for i, (_, widget) in enumerate(service_widgets):
             # Position from right edge with consistent spacing
             widget_x = self.width - (i + 1) * service_spacing
-            widget.render(draw, widget_x, top_row_y, self.width)
+            self._render_widget(widget, draw, widget_x, top_row_y)
+            if widget.active:
+                services_left = widget_x
         
         # Draw a horizontal divider line with a dashed pattern to simulate 50% opacity
         # Since OLED is monochrome and doesn't support opacity, we use a dashed pattern
@@ -85,19 +188,38 @@ class DisplayManager:
         # Render text widgets on bottom row
         x = 0
         for widget in self.bottom_row_widgets:
-            x, _ = widget.render(draw, x, bottom_row_y, self.width)
+            x, _ = self._render_widget(widget, draw, x, bottom_row_y)
+        self.current_widget = None
+
+        # Record layout overflow: resources running into the service icons, or text off screen
+        self.row_extents["top"] = top_row_end
+        self.row_extents["bottom"] = x
+        self.overflow = []
+        if top_row_end - RESOURCE_TRAILING_GAP > services_left:
+            self.overflow.append("top")
+        if x - TEXT_TRAILING_GAP > self.width:
+            self.overflow.append("bottom")
         
         # Show on the display
         self.device.display(image)
+        self.current_phase = None
 
     def update(self):
         """Update data for all widgets and redraw the display."""
-        # Update all widgets
+        # Update all widgets, timing each one
+        self.current_phase = "update"
         for _, widget in self.top_row_widgets:
-            widget.update()
-            
+            self._update_widget(widget)
         for widget in self.bottom_row_widgets:
-            widget.update()
+            self._update_widget(widget)
+        self.current_widget = None
+
+        # Share the collected values with listeners (e.g. the metrics socket)
+        if self.listeners:
+            self.current_phase = "listeners"
+            snapshot = self.snapshot()
+            for callback in self.listeners:
+                callback(snapshot)
             
         # Render the updated widgets
         self.render()
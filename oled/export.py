@@ -0,0 +1,244 @@
+"""
+SnapshotServer: Publishes widget snapshots to local agents over a Unix socket.
+"""
+import errno
+import json
+import os
+import selectors
+import socket
+import stat
+import threading
+
+DEFAULT_SOCKET_PATH = "/run/rpi-oled/metrics.sock"
+
+class _Client:
+    """Queued output of one connected client."""
+    __slots__ = ("pending", "head_sent", "last_line")
+
+    def __init__(self, line):
+        self.pending = bytearray(line)
+        self.head_sent = 0  # Bytes of the first queued line already sent
+        self.last_line = line  # Last snapshot line queued, to queue each one only once
+
+class SnapshotServer:
+    """
+    Serves the latest DisplayManager snapshot as JSON lines on a Unix stream socket.
+
+    Each client receives the current snapshot when it connects and one line
+    every time the collected values change. Sockets are handled by a background
+    thread, so publish() only encodes the snapshot and never blocks on clients.
+    """
+    def __init__(self, path=DEFAULT_SOCKET_PATH, mode=0o660, max_pending=65536):
+        """
+        Initialize the server.
+
+        Args:
+            path: Filesystem path of the Unix socket
+            mode: Permissions applied to the socket file
+            max_pending: Bytes queued for a slow client before older lines are dropped
+        """
+        self.path = path
+        self.mode = mode
+        self.max_pending = max_pending
+
+        self._latest = b""
+        self._last_widgets = None
+        self._lock = threading.Lock()
+        self._selector = None
+        self._listener = None
+        self._wake_reader = None
+        self._wake_writer = None
+        self._clients = {}  # socket -> _Client
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        """
+        Create the socket and start serving clients in a background thread.
+
+        Raises:
+            OSError: If the path exists and is not a socket, or another service is listening on it
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._remove_stale_socket()
+
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.path)
+        os.chmod(self.path, self.mode)
+        self._listener.listen()
+        self._listener.setblocking(False)
+
+        # Used by publish() and close() to wake the serving thread
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._listener, selectors.EVENT_READ, self._accept)
+        self._selector.register(self._wake_reader, selectors.EVENT_READ, self._wake)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="snapshot-server", daemon=True)
+        self._thread.start()
+
+    def _remove_stale_socket(self):
+        """Remove a socket left behind by a previous run, refusing to touch anything else."""
+        try:
+            mode = os.lstat(self.path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise OSError(errno.EEXIST, "Path exists and is not a socket", self.path)
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            # Nobody is listening, so the socket is stale
+            os.unlink(self.path)
+            return
+        finally:
+            probe.close()
+        raise OSError(errno.EADDRINUSE, "Socket is in use by another process", self.path)
+
+    def publish(self, snapshot):
+        """
+        Publish a snapshot if its values changed; usable as a DisplayManager listener.
+
+        Args:
+            snapshot: Dict as returned by DisplayManager.snapshot()
+        """
+        widgets = snapshot["widgets"]
+        if widgets == self._last_widgets:
+            return
+        self._last_widgets = widgets
+
+        line = json.dumps(snapshot, separators=(",", ":")).encode() + b"\n"
+        with self._lock:
+            self._latest = line
+        self._notify()
+
+    def close(self):
+        """Stop the serving thread, disconnect clients and remove the socket."""
+        if not self._running:
+            return
+        self._running = False
+        self._notify()
+        self._thread.join(timeout=2)
+
+        for client in list(self._clients):
+            self._drop(client)
+        self._selector.close()
+        self._listener.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _notify(self):
+        """Wake the serving thread; a full wake pipe already guarantees a wakeup."""
+        try:
+            self._wake_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def _serve(self):
+        """Serving thread main loop."""
+        while self._running:
+            for key, events in self._selector.select():
+                key.data(key.fileobj, events)
+
+    def _accept(self, listener, events):
+        """Accept new clients and queue the current snapshot for them."""
+        while True:
+            try:
+                client, _ = listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            client.setblocking(False)
+            with self._lock:
+                state = _Client(self._latest)
+            self._clients[client] = state
+            self._selector.register(client, self._events(state.pending), self._service)
+
+    def _wake(self, wake_reader, events):
+        """Queue the latest snapshot for every client."""
+        try:
+            while wake_reader.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+        with self._lock:
+            line = self._latest
+        if not line:
+            return
+        for client, state in self._clients.items():
+            # A wake can be handled after the line it announced was already
+            # queued by an earlier wake or on connect
+            if state.last_line is line:
+                continue
+            state.last_line = line
+            pending = state.pending
+            # Slow readers only need the newest values, so drop queued lines they have
+            # not read yet, keeping the rest of a partially sent line intact
+            if len(pending) + len(line) > self.max_pending:
+                if state.head_sent:
+                    del pending[pending.find(b"\n") + 1:]
+                else:
+                    pending.clear()
+            pending += line
+            self._selector.modify(client, self._events(pending), self._service)
+
+    def _service(self, client, events):
+        """Flush queued data to a client and detect disconnects."""
+        if events & selectors.EVENT_READ:
+            try:
+                # Clients are not expected to send anything; an empty read means EOF
+                if not client.recv(4096):
+                    self._drop(client)
+                    return
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._drop(client)
+                return
+
+        state = self._clients[client]
+        pending = state.pending
+        if events & selectors.EVENT_WRITE and pending:
+            try:
+                sent = client.send(pending)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                self._drop(client)
+                return
+            line_end = pending.rfind(b"\n", 0, sent)
+            if line_end < 0:
+                state.head_sent += sent
+            else:
+                state.head_sent = sent - line_end - 1
+            del pending[:sent]
+            if not pending:
+                self._selector.modify(client, self._events(pending), self._service)
+
+    def _drop(self, client):
+        """Disconnect a client."""
+        self._clients.pop(client, None)
+        try:
+            self._selector.unregister(client)
+        except (KeyError, ValueError):
+            pass
+        client.close()
+
+    @staticmethod
+    def _events(pending):
+        """Selector events to wait for given a client's queued data."""
+        if pending:
+            return selectors.EVENT_READ | selectors.EVENT_WRITE
+        return selectors.EVENT_READ
@@ -0,0 +1,51 @@
+"""
+Standard widget layout shared by the service and the offline tools.
+"""
+from .widgets.cpu import CPUWidget, CPUCoresWidget
+from .widgets.ram import RAMWidget
+from .widgets.temp import TempWidget
+from .widgets.docker import DockerWidget
+from .widgets.ceph import CephWidget
+from .widgets.network import IPAddressWidget, NetworkThroughputWidget
+from .widgets.disk import DiskThroughputWidget
+from .widgets.hostname import HostnameWidget
+from .widgets.cluster import ClusterSummaryWidget, ClusterNodeWidget
+
+# Choices for the widget next to the hostname on the bottom row
+BOTTOM_WIDGETS = ("ip", "network", "disk")
+
+def add_default_widgets(display, cluster_table=None, cluster_view="summary",
+                        per_core_cpu=False, bottom_widget="ip", device=None):
+    """
+    Add the standard widgets to a display manager.
+
+    Args:
+        display: DisplayManager to populate
+        cluster_table: oled.cluster.ClusterTable; replaces the bottom widget with a cluster view
+        cluster_view: "summary" for aggregate peer stats, "nodes" to rotate through peers
+        per_core_cpu: Show one bar per core instead of the aggregate CPU percentage
+        bottom_widget: "ip" for the IP address, "network" or "disk" for throughput
+        device: Interface (network) or block device (disk) to show instead of the total
+    """
+    # Add resource widgets for top row (CPU, RAM, Temperature)
+    display.add_resource_widget(CPUCoresWidget() if per_core_cpu else CPUWidget())
+    display.add_resource_widget(RAMWidget())
+    display.add_resource_widget(TempWidget())
+
+    # Add service widgets for top row (Docker, Ceph)
+    display.add_service_widget(DockerWidget())
+    display.add_service_widget(CephWidget())
+
+    # Add text widgets for bottom row (Hostname, then IP, throughput or cluster view)
+    display.add_text_widget(HostnameWidget())
+    if cluster_table is not None:
+        if cluster_view == "nodes":
+            display.add_text_widget(ClusterNodeWidget(cluster_table))
+        else:
+            display.add_text_widget(ClusterSummaryWidget(cluster_table))
+    elif bottom_widget == "network":
+        display.add_text_widget(NetworkThroughputWidget(interface=device))
+    elif bottom_widget == "disk":
+        display.add_text_widget(DiskThroughputWidget(device=device))
+    else:
+        display.add_text_widget(IPAddressWidget())
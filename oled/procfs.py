@@ -0,0 +1,127 @@
+"""
+Low-overhead readers for /proc counter files.
+These keep the file open between ticks, read it into a reused buffer and parse
+the counters straight out of that buffer.
+"""
+import os
+
+
+class ProcFile:
+    """
+    Reads a /proc file into a reused buffer, keeping the file open between reads.
+    """
+    def __init__(self, path, size=4096):
+        """
+        Initialize the reader.
+
+        Args:
+            path: Path of the /proc file (e.g. /proc/net/dev)
+            size: Initial buffer size in bytes; grown automatically if too small
+        """
+        self.path = path
+        self._buf = bytearray(size)
+        self._size = 0
+        self._fd = None
+
+    def read(self):
+        """
+        Refresh the buffer with the current contents of the file.
+
+        Returns:
+            int: Number of valid bytes in the buffer
+
+        Raises:
+            OSError: If the file cannot be opened or read
+        """
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        # procfs regenerates the contents on every read from offset 0
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        size = 0
+        while True:
+            if size == len(self._buf):
+                # Buffer is full - grow it, keeping what was read so far
+                grown = bytearray(len(self._buf) * 2)
+                grown[:size] = self._buf
+                self._buf = grown
+            # procfs returns at most about one page per call, whatever the
+            # buffer size, so only a read of 0 bytes marks the end of the file
+            with memoryview(self._buf) as view:
+                count = os.readv(self._fd, [view[size:]])
+            if count == 0:
+                break
+            size += count
+        self._size = size
+        return size
+
+    def finditer(self, pattern):
+        """
+        Read the file and match a compiled bytes regex against the buffer in place.
+
+        Only the matched groups are copied out, so the file contents are never
+        split into per-line objects.
+
+        Args:
+            pattern: Compiled bytes regular expression (typically re.MULTILINE)
+
+        Returns:
+            iterator: Match objects over the current contents
+        """
+        size = self.read()
+        return pattern.finditer(self._buf, 0, size)
+
+    def close(self):
+        """Close the underlying file descriptor."""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __del__(self):
+        self.close()
+
+
+class NameCache:
+    """
+    Caches a per-name predicate (e.g. "is this a physical interface?") and
+    forgets names that disappear, so churn such as container veth pairs
+    does not grow the cache forever.
+
+    Usage per read: begin(), call the cache for each name, end().
+    """
+    def __init__(self, predicate):
+        """
+        Initialize the cache.
+
+        Args:
+            predicate: Callable taking a name and returning a bool
+        """
+        self.predicate = predicate
+        self._entries = {}  # name -> [result, generation]
+        self._generation = 0
+        self._seen = 0
+
+    def begin(self):
+        """Start a new read."""
+        self._generation += 1
+        self._seen = 0
+
+    def __call__(self, name):
+        """Return the (cached) predicate result for a name seen in this read."""
+        self._seen += 1
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = [bool(self.predicate(name)), self._generation]
+        else:
+            entry[1] = self._generation
+        return entry[0]
+
+    def end(self):
+        """Finish a read, dropping names that were not seen."""
+        if self._seen < len(self._entries):
+            stale = [name for name, entry in self._entries.items()
+                     if entry[1] != self._generation]
+            for name in stale:
+                del self._entries[name]
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,206 @@
+"""
+Per-widget timing statistics and an on-demand sampling profiler for the running service.
+"""
+import os
+import signal
+import sys
+import threading
+import time
+
+# Command bytes passed from the signal handlers to the reporting thread
+PROFILE_COMMAND = ord("p")
+STATS_COMMAND = ord("s")
+
+class WidgetTiming:
+    """
+    Cumulative update() and render() timings of one widget.
+    """
+    __slots__ = ("updates", "update_total", "update_max", "renders", "render_total", "render_max")
+
+    def __init__(self):
+        self.updates = 0
+        self.update_total = 0.0
+        self.update_max = 0.0
+        self.renders = 0
+        self.render_total = 0.0
+        self.render_max = 0.0
+
+    def add_update(self, seconds):
+        """Record the duration of one update() call."""
+        self.updates += 1
+        self.update_total += seconds
+        if seconds > self.update_max:
+            self.update_max = seconds
+
+    def add_render(self, seconds):
+        """Record the duration of one render() call."""
+        self.renders += 1
+        self.render_total += seconds
+        if seconds > self.render_max:
+            self.render_max = seconds
+
+def format_timings(timings):
+    """
+    Format per-widget timings as a table.
+
+    Args:
+        timings: Mapping of widget name to WidgetTiming (DisplayManager.timings)
+
+    Returns:
+        str: Multi-line table with call counts, mean and max milliseconds
+    """
+    lines = [
+        f"{'widget':<28}{'updates':>9}{'mean ms':>9}{'max ms':>9}{'renders':>9}{'mean ms':>9}{'max ms':>9}"
+    ]
+    for name, timing in timings.items():
+        update_mean = timing.update_total / timing.updates if timing.updates else 0.0
+        render_mean = timing.render_total / timing.renders if timing.renders else 0.0
+        lines.append(
+            f"{name:<28}{timing.updates:>9}{update_mean * 1000:>9.2f}{timing.update_max * 1000:>9.2f}"
+            f"{timing.renders:>9}{render_mean * 1000:>9.2f}{timing.render_max * 1000:>9.2f}"
+        )
+    return "\n".join(lines)
+
+class SamplingProfiler:
+    """
+    Time-boxed statistical profiler for the display loop.
+
+    A background thread periodically captures the main thread's stack and
+    prefixes it with the DisplayManager phase and widget being processed, e.g.
+    "update;DockerWidget;main (run_oled_service.py:60);...". The result is
+    written in collapsed-stack format, ready for flamegraph.pl or speedscope.
+    """
+    def __init__(self, display, thread_id=None, interval=0.01, duration=30.0, output_dir="/tmp",
+                 max_depth=64):
+        """
+        Initialize the profiler.
+
+        Args:
+            display: DisplayManager whose loop is profiled
+            thread_id: Thread running the loop (default: the main thread)
+            interval: Seconds between stack samples
+            duration: Seconds each profiling session lasts
+            output_dir: Directory receiving the .folded output files
+            max_depth: Maximum stack frames recorded per sample
+        """
+        self.display = display
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.interval = interval
+        self.duration = duration
+        self.output_dir = output_dir
+        self.max_depth = max_depth
+        self._thread = None
+
+    @property
+    def running(self):
+        """True while a profiling session is in progress."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """
+        Start a profiling session in the background.
+
+        Returns:
+            bool: False if a session is already running
+        """
+        if self.running:
+            return False
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def _collapse(self, frame):
+        """Build the ';'-separated root-to-leaf stack string for a frame."""
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        names.reverse()
+        return ";".join(names)
+
+    def _run(self):
+        """Profiler thread: sample until the deadline, then write the output file."""
+        counts = {}
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            phase = self.display.current_phase
+            if phase is None:
+                # Sleeping between ticks; walking the stack would add nothing
+                key = "idle"
+            else:
+                widget = self.display.current_widget or "-"
+                key = f"{phase};{widget};{self._collapse(frame)}"
+            counts[key] = counts.get(key, 0) + 1
+            del frame
+
+        path = os.path.join(self.output_dir, time.strftime("rpi-oled-profile-%Y%m%d-%H%M%S.folded"))
+        try:
+            with open(path, "w") as f:
+                for key, count in sorted(counts.items()):
+                    f.write(f"{key} {count}\n")
+            print(f"Profile with {sum(counts.values())} samples written to {path}", flush=True)
+        except OSError as e:
+            print(f"Error writing profile: {e}", flush=True)
+
+def install_signal_handlers(display, profile_signal=signal.SIGUSR1, stats_signal=signal.SIGUSR2,
+                            **profiler_options):
+    """
+    Let a running service be profiled without restarting it.
+
+    profile_signal starts a SamplingProfiler session; stats_signal prints the
+    per-widget timing table. Must be called from the main thread.
+
+    The handlers only write a command byte to a pipe. A daemon thread does the
+    printing, because a handler that prints could interrupt a print in the main
+    thread and fail with a reentrant call on stdout.
+
+    Args:
+        display: DisplayManager running in the main thread
+        profile_signal: Signal starting a profiling session
+        stats_signal: Signal dumping DisplayManager.timings
+        **profiler_options: Passed on to SamplingProfiler
+
+    Returns:
+        SamplingProfiler: The profiler started by profile_signal
+    """
+    profiler = SamplingProfiler(display, **profiler_options)
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(write_fd, False)
+
+    def on_profile():
+        if profiler.start():
+            print(f"Profiling display loop for {profiler.duration:.0f}s", flush=True)
+        else:
+            print("Profiler already running", flush=True)
+
+    def on_stats():
+        print(format_timings(display.timings), flush=True)
+
+    commands = {PROFILE_COMMAND: on_profile, STATS_COMMAND: on_stats}
+
+    def serve():
+        while True:
+            for command in os.read(read_fd, 64):
+                try:
+                    commands[command]()
+                except Exception as e:
+                    print(f"Error handling signal: {e}", flush=True)
+
+    def notify(command):
+        def handler(signum, frame):
+            try:
+                os.write(write_fd, bytes((command,)))
+            except OSError:
+                # Pipe full: earlier requests are still pending
+                pass
+        return handler
+
+    threading.Thread(target=serve, name="signal-commands", daemon=True).start()
+    signal.signal(profile_signal, notify(PROFILE_COMMAND))
+    signal.signal(stats_signal, notify(STATS_COMMAND))
+    return profiler
@@ -0,0 +1,247 @@
+"""
+Rate calculation for monotonically increasing kernel counters (bytes, sectors).
+"""
+import time
+from .procfs import ProcFile, NameCache
+
+COUNTER_32 = 1 << 32
+# A 32-bit counter that wrapped between two readings cannot have advanced by
+# more than this; a larger "wrapped" increase means the counter was reset
+MAX_WRAP_DELTA = 1 << 31
+
+RATE_UNITS = ("", "K", "M", "G", "T")
+
+
+def counter_delta(current, previous):
+    """
+    Return the increase between two raw counter readings, allowing for wraparound.
+
+    A decrease is treated as a 32-bit wrap (as on 32-bit Raspberry Pi kernels)
+    only if the previous value fits in 32 bits and the wrapped increase is
+    plausible. 64-bit counters do not wrap in practice, so any other decrease
+    is a reset (interface re-created, driver reloaded).
+
+    Args:
+        current: Latest counter value, unscaled (bytes, sectors)
+        previous: Previous counter value, unscaled
+
+    Returns:
+        int: Non-negative increase since the previous reading, or None after a reset
+    """
+    if current >= previous:
+        return current - previous
+    if previous < COUNTER_32:
+        delta = current + COUNTER_32 - previous
+        if delta <= MAX_WRAP_DELTA:
+            return delta
+    return None
+
+
+def format_rate(value):
+    """
+    Format a byte rate in at most four characters, e.g. 0, 980, 1.2K, 34K, 5.6M.
+
+    Args:
+        value: Rate in bytes per second
+
+    Returns:
+        str: Compact human-readable rate using 1024-based units
+    """
+    value = float(value)
+    for unit in RATE_UNITS:
+        if value < 9.95 and unit:
+            return f"{value:.1f}{unit}"
+        if value < 999.5:
+            return f"{int(value + 0.5)}{unit}"
+        value /= 1024
+    return f"{int(value * 1024)}{RATE_UNITS[-1]}"
+
+
+class _CounterPair:
+    """Last readings and smoothed rates for one interface or device."""
+    __slots__ = ("first", "second", "first_rate", "second_rate", "primed", "generation")
+
+    def __init__(self, first, second, generation):
+        self.first = first
+        self.second = second
+        self.first_rate = 0.0
+        self.second_rate = 0.0
+        self.primed = False
+        self.generation = generation
+
+
+class RateTracker:
+    """
+    Tracks EWMA-smoothed per-second rates for named pairs of counters
+    (rx/tx bytes, read/write sectors).
+
+    Usage per tick: begin(), sample() for each name, end(), then totals().
+    Entries are updated in place so steady-state ticks do not allocate.
+    """
+    def __init__(self, alpha=0.5, clock=time.monotonic):
+        """
+        Initialize the tracker.
+
+        Args:
+            alpha: EWMA weight of the newest sample (1.0 disables smoothing)
+            clock: Monotonic time source in seconds
+        """
+        self.alpha = alpha
+        self.clock = clock
+        self._entries = {}
+        self._generation = 0
+        self._seen = 0
+        self._elapsed = 0.0
+        self._last_time = None
+
+    def begin(self):
+        """Start a sampling round; call once per read of the counter file."""
+        now = self.clock()
+        self._elapsed = now - self._last_time if self._last_time is not None else 0.0
+        self._last_time = now
+        self._generation += 1
+        self._seen = 0
+
+    def sample(self, name, first, second):
+        """
+        Record the current counter values for a name.
+
+        Args:
+            name: Interface or device name
+            first: First counter (rx bytes, bytes read)
+            second: Second counter (tx bytes, bytes written)
+        """
+        self._seen += 1
+        entry = self._entries.get(name)
+        if entry is None:
+            self._entries[name] = _CounterPair(first, second, self._generation)
+            return
+
+        # Only compute a rate against a reading from the immediately preceding round
+        first_delta = second_delta = None
+        if self._elapsed > 0 and entry.generation == self._generation - 1:
+            first_delta = counter_delta(first, entry.first)
+            second_delta = counter_delta(second, entry.second)
+
+        if first_delta is not None and second_delta is not None:
+            first_rate = first_delta / self._elapsed
+            second_rate = second_delta / self._elapsed
+            if entry.primed:
+                alpha = self.alpha
+                entry.first_rate += alpha * (first_rate - entry.first_rate)
+                entry.second_rate += alpha * (second_rate - entry.second_rate)
+            else:
+                entry.first_rate = first_rate
+                entry.second_rate = second_rate
+                entry.primed = True
+        else:
+            # Gap or counter reset: start over from this reading
+            entry.primed = False
+            entry.first_rate = entry.second_rate = 0.0
+
+        entry.first = first
+        entry.second = second
+        entry.generation = self._generation
+
+    def end(self):
+        """Finish a sampling round, dropping names that have disappeared."""
+        if self._seen < len(self._entries):
+            stale = [name for name, entry in self._entries.items()
+                     if entry.generation != self._generation]
+            for name in stale:
+                del self._entries[name]
+
+    def rates(self, name):
+        """
+        Return the smoothed rates for a single name.
+
+        Returns:
+            tuple: (first_rate, second_rate) per second, zeros if unknown
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            return (0.0, 0.0)
+        return (entry.first_rate, entry.second_rate)
+
+    def totals(self):
+        """
+        Return the smoothed rates summed over all tracked names.
+
+        Returns:
+            tuple: (first_rate, second_rate) per second
+        """
+        first = second = 0.0
+        for entry in self._entries.values():
+            first += entry.first_rate
+            second += entry.second_rate
+        return (first, second)
+
+
+class CounterSource:
+    """
+    Reads a /proc file of named counter pairs and tracks their rates.
+
+    Several widgets (e.g. a total and a per-interface view) can share one
+    source; it re-reads the file at most once per `min_interval` seconds.
+    """
+    def __init__(self, path, pattern, include, scale=1, alpha=0.5, clock=time.monotonic,
+                 min_interval=0.5):
+        """
+        Initialize the source.
+
+        Args:
+            path: /proc file to read
+            pattern: Compiled bytes regex with groups (name, first counter, second counter)
+            include: Callable deciding from a name (bytes) whether it is counted
+            scale: Multiplier from counter units to bytes (e.g. 512 for sectors)
+            alpha: EWMA smoothing weight of the newest sample
+            clock: Monotonic time source in seconds
+            min_interval: Minimum seconds between reads of the file
+        """
+        self.pattern = pattern
+        self.scale = scale
+        self.clock = clock
+        self.min_interval = min_interval
+        self._proc = ProcFile(path)
+        self._names = NameCache(include)
+        self._tracker = RateTracker(alpha=alpha, clock=clock)
+        self._last_read = None
+
+    def refresh(self):
+        """
+        Read the counters unless another widget already did so recently.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        now = self.clock()
+        if self._last_read is not None and now - self._last_read < self.min_interval:
+            return
+        matches = self._proc.finditer(self.pattern)
+        self._last_read = now
+
+        tracker = self._tracker
+        tracker.begin()
+        self._names.begin()
+        for match in matches:
+            name = match.group(1)
+            if self._names(name):
+                tracker.sample(name, int(match.group(2)), int(match.group(3)))
+        self._names.end()
+        tracker.end()
+
+    def rates(self, name=None):
+        """
+        Return smoothed rates in bytes per second.
+
+        Args:
+            name: Interface or device name (default: sum over all counted names)
+
+        Returns:
+            tuple: (first_rate, second_rate)
+        """
+        if name is None:
+            first, second = self._tracker.totals()
+        else:
+            first, second = self._tracker.rates(name.encode() if isinstance(name, str) else name)
+        return (first * self.scale, second * self.scale)
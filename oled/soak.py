@@ -0,0 +1,207 @@
+"""
+Long-run soak testing: run the update/render loop for weeks of virtual ticks
+and watch for memory growth.
+"""
+import os
+import time
+import tracemalloc
+from .widgets.base import ServiceWidget
+
+def read_rss():
+    """
+    Return the resident set size of this process.
+
+    Returns:
+        int: RSS in bytes
+    """
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+class SoakReport:
+    """
+    Memory samples and growth analysis from a soak run.
+
+    RSS is sampled during the untraced run, so tracemalloc's own bookkeeping
+    does not show up as growth; Python allocations are compared over a
+    separate traced run that follows it.
+    """
+    def __init__(self, tick_seconds, max_rss_growth, max_traced_growth):
+        """
+        Initialize the report.
+
+        Args:
+            tick_seconds: Virtual seconds per tick, used to express the simulated duration
+            max_rss_growth: Allowed RSS growth in bytes after warmup
+            max_traced_growth: Allowed growth of Python allocations in bytes during the traced run
+        """
+        self.tick_seconds = tick_seconds
+        self.max_rss_growth = max_rss_growth
+        self.max_traced_growth = max_traced_growth
+        self.rss_samples = []  # (tick, rss bytes)
+        self.traced_samples = []  # (tick, traced bytes)
+        self.top_growth = []  # tracemalloc.StatisticDiff, largest growth first
+        self.ticks = 0
+        self.traced_ticks = 0
+        self.elapsed = 0.0
+        self.traced_elapsed = 0.0
+
+    def add_rss_sample(self, tick, rss):
+        """Record one RSS sample from the untraced run."""
+        self.rss_samples.append((tick, rss))
+
+    def add_traced_sample(self, tick, traced):
+        """Record one tracemalloc sample from the traced run."""
+        self.traced_samples.append((tick, traced))
+
+    @property
+    def rss_growth(self):
+        """RSS growth in bytes between the first and last sample."""
+        return self.rss_samples[-1][1] - self.rss_samples[0][1] if self.rss_samples else 0
+
+    @property
+    def traced_growth(self):
+        """Traced Python allocation growth in bytes between the first and last sample."""
+        return self.traced_samples[-1][1] - self.traced_samples[0][1] if self.traced_samples else 0
+
+    @property
+    def passed(self):
+        """True if growth stayed within both thresholds."""
+        return (self.rss_growth <= self.max_rss_growth
+                and self.traced_growth <= self.max_traced_growth)
+
+    def summary(self):
+        """
+        Format the report for printing.
+
+        Returns:
+            str: Multi-line human-readable summary
+        """
+        simulated = self.ticks * self.tick_seconds
+        lines = [
+            f"Ticks: {self.ticks} ({simulated / 86400:.2f} simulated days) "
+            f"in {self.elapsed:.1f}s ({self.ticks / max(self.elapsed, 1e-9):.0f} ticks/s)",
+            "RSS samples (tick, RSS):",
+        ]
+        for tick, rss in self.rss_samples:
+            lines.append(f"  {tick:>10}  {rss / 1048576:8.2f} MiB")
+        lines.append(
+            f"Traced ticks: {self.traced_ticks} in {self.traced_elapsed:.1f}s"
+        )
+        lines.append("Traced samples (tick, traced):")
+        for tick, traced in self.traced_samples:
+            lines.append(f"  {tick:>10}  {traced / 1048576:8.3f} MiB")
+        lines.append(
+            f"RSS growth: {self.rss_growth / 1024:.1f} KiB (limit {self.max_rss_growth / 1024:.0f} KiB)"
+        )
+        lines.append(
+            f"Traced growth: {self.traced_growth / 1024:.1f} KiB "
+            f"(limit {self.max_traced_growth / 1024:.0f} KiB)"
+        )
+        if self.top_growth:
+            lines.append("Top growing allocation sites:")
+            for stat in self.top_growth:
+                frame = stat.traceback[0]
+                lines.append(
+                    f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+7d} blocks  "
+                    f"{frame.filename}:{frame.lineno}"
+                )
+        lines.append("PASS" if self.passed else "FAIL: memory growth exceeded the limit")
+        return "\n".join(lines)
+
+def stub_service_probes(display, period=60):
+    """
+    Replace the subprocess probes of service widgets (systemctl, docker, ceph)
+    with a stub that toggles the icon every `period` updates.
+
+    Forking a process per widget per tick dominates the soak runtime and
+    depends on the host, while the render path only needs both icon states.
+
+    Args:
+        display: DisplayManager whose service widgets are stubbed
+        period: Updates between icon state changes
+    """
+    for widget in display.widgets.values():
+        if isinstance(widget, ServiceWidget):
+            widget.update = _ToggleProbe(widget, period)
+
+class _ToggleProbe:
+    """Stand-in for ServiceWidget.update() used by stub_service_probes()."""
+    __slots__ = ("widget", "period", "calls")
+
+    def __init__(self, widget, period):
+        self.widget = widget
+        self.period = period
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.widget.active = (self.calls // self.period) % 2 == 0
+
+def run_soak(display, clock, ticks, tick_seconds=1.0, warmup=1000, sample_every=10000,
+             traced_ticks=None, top=10, max_rss_growth=4 << 20, max_traced_growth=1 << 20):
+    """
+    Run display.update() for many ticks on a virtual clock without sleeping.
+
+    After a warmup period (caches, fonts and lazily opened files settle
+    first) the loop runs `ticks` times untraced, sampling RSS every
+    `sample_every` ticks, then `traced_ticks` more times under tracemalloc
+    to find growing allocation sites.
+
+    Args:
+        display: DisplayManager, normally backed by luma.core.device.dummy
+        clock: VirtualClock shared with the display and widgets
+        ticks: Number of untraced update/render cycles after warmup
+        tick_seconds: Virtual seconds the clock advances per tick
+        warmup: Ticks run before the baseline sample
+        sample_every: Ticks between memory samples
+        traced_ticks: Cycles run under tracemalloc (default: a tenth of `ticks`)
+        top: Number of growing allocation sites to report
+        max_rss_growth: Allowed RSS growth in bytes
+        max_traced_growth: Allowed growth of traced Python allocations in bytes
+
+    Returns:
+        SoakReport: Samples, growth and pass/fail result
+    """
+    report = SoakReport(tick_seconds, max_rss_growth, max_traced_growth)
+    if traced_ticks is None:
+        traced_ticks = max(1, ticks // 10)
+    ignore_tracemalloc = (tracemalloc.Filter(False, tracemalloc.__file__),)
+
+    for _ in range(warmup):
+        clock.advance(tick_seconds)
+        display.update()
+
+    # Untraced run: RSS reflects the service, not tracemalloc's bookkeeping
+    started = time.perf_counter()
+    report.add_rss_sample(0, read_rss())
+    for tick in range(1, ticks + 1):
+        clock.advance(tick_seconds)
+        display.update()
+        if tick % sample_every == 0 or tick == ticks:
+            report.add_rss_sample(tick, read_rss())
+    report.ticks = ticks
+    report.elapsed = time.perf_counter() - started
+
+    # Traced run: attribute any growth of Python objects to allocation sites
+    started = time.perf_counter()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+        report.add_traced_sample(0, tracemalloc.get_traced_memory()[0])
+
+        for tick in range(1, traced_ticks + 1):
+            clock.advance(tick_seconds)
+            display.update()
+            if tick % sample_every == 0 or tick == traced_ticks:
+                report.add_traced_sample(tick, tracemalloc.get_traced_memory()[0])
+
+        final = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+    finally:
+        tracemalloc.stop()
+
+    report.traced_ticks = traced_ticks
+    report.traced_elapsed = time.perf_counter() - started
+    growth = [stat for stat in final.compare_to(baseline, "lineno") if stat.size_diff > 0]
+    report.top_growth = growth[:top]
+    return report
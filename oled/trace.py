@@ -0,0 +1,273 @@
+"""
+Recording of collected widget values and accelerated offline replay.
+
+A trace is an append-only JSON-lines file. Each recording session starts with a
+header line, followed by one line per tick holding the time offset and only the
+widget states that changed since the previous tick:
+
+    {"trace": 1, "start": 1730000000.0}
+    {"t": 0.0, "w": {"CPUWidget": {"value": 3.1}, "RAMWidget": {"value": 41.2}}}
+    {"t": 1.002, "w": {"CPUWidget": {"value": 7.9}}}
+"""
+import json
+import os
+import time
+
+TRACE_VERSION = 1
+# Default size at which a trace is rotated to "<path>.1"
+DEFAULT_MAX_TRACE_BYTES = 16 << 20
+# Overflow events listed individually in ReplayReport.summary()
+MAX_LISTED_EVENTS = 20
+
+class VirtualClock:
+    """
+    Manually advanced clock; a drop-in replacement for time.time or time.monotonic.
+    """
+    def __init__(self, start=0.0):
+        """
+        Initialize the clock.
+
+        Args:
+            start: Initial time in seconds
+        """
+        self.now = start
+
+    def __call__(self):
+        """Return the current virtual time."""
+        return self.now
+
+    def set(self, now):
+        """Jump to an absolute time."""
+        self.now = now
+
+    def advance(self, seconds):
+        """Move the clock forward."""
+        self.now += seconds
+
+class TraceRecorder:
+    """
+    Appends DisplayManager snapshots to a trace file.
+
+    When the file reaches `max_bytes` it is renamed to "<path>.1" (replacing
+    the previous one) and a new file is started with a fresh header and the
+    full widget state, so each file can be replayed on its own. A write error
+    is reported once and disables recording instead of failing every tick.
+    """
+    def __init__(self, path, max_bytes=DEFAULT_MAX_TRACE_BYTES, flush_every=10):
+        """
+        Initialize the recorder.
+
+        Args:
+            path: Trace file; appended to if it already exists
+            max_bytes: Size in bytes at which the file is rotated (0 disables rotation)
+            flush_every: Ticks buffered between flushes; a crash loses at most this many
+
+        Raises:
+            OSError: If the trace file cannot be opened
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        self.enabled = True
+        self.file = open(path, "a")
+        self._size = self.file.tell()
+        self._pending = 0
+        self._start = None
+        self._last = {}
+
+    def record(self, snapshot):
+        """
+        Write the changed widget states; usable as a DisplayManager listener.
+
+        Args:
+            snapshot: Dict as returned by DisplayManager.snapshot()
+        """
+        if not self.enabled:
+            return
+        try:
+            if self.max_bytes and self._size >= self.max_bytes:
+                self._rotate()
+
+            if self._start is None:
+                self._start = snapshot["time"]
+                self._write({"trace": TRACE_VERSION, "start": self._start})
+
+            changed = {}
+            for name, state in snapshot["widgets"].items():
+                if self._last.get(name) != state:
+                    changed[name] = state
+                    self._last[name] = state
+            self._write({"t": round(snapshot["time"] - self._start, 3), "w": changed})
+
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self.file.flush()
+                self._pending = 0
+        except OSError as e:
+            print(f"Error writing trace {self.path}: {e}; recording disabled", flush=True)
+            self.enabled = False
+            self._close_quietly()
+
+    def _write(self, entry):
+        """Append one line to the file buffer."""
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        self.file.write(line)
+        self._size += len(line)
+
+    def _rotate(self):
+        """Move the full trace aside and start a new one with a header and full state."""
+        self.file.close()
+        os.replace(self.path, self.path + ".1")
+        self.file = open(self.path, "w")
+        self._size = 0
+        self._pending = 0
+        self._start = None
+        self._last = {}
+
+    def _close_quietly(self):
+        """Close the file after an error, ignoring a failing final flush."""
+        try:
+            self.file.close()
+        except OSError:
+            pass
+
+    def close(self):
+        """Flush and close the trace file."""
+        if self.enabled:
+            self.enabled = False
+            self.file.close()
+
+def read_trace(path):
+    """
+    Iterate over the ticks of a trace file.
+
+    Args:
+        path: Trace file written by TraceRecorder
+
+    Yields:
+        tuple: (absolute time, {widget name: changed state}) per tick
+    """
+    start = 0.0
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A partial last line is expected if the service was killed mid-write
+                continue
+            if "trace" in entry:
+                if entry["trace"] != TRACE_VERSION:
+                    raise ValueError(f"Unsupported trace version {entry['trace']} in {path}")
+                start = entry["start"]
+                continue
+            yield start + entry["t"], entry["w"]
+
+class ReplayReport:
+    """
+    Render cost and layout overflow statistics collected during a replay.
+    """
+    def __init__(self):
+        self.frames = 0
+        self.skipped_ticks = 0
+        self.render_times = []
+        self.overflow_frames = 0
+        self.overflow_events = []  # (time, row, right edge) when a row starts overflowing
+        self.unknown_widgets = set()
+        self.start_time = None
+        self.end_time = None
+        self._overflowing = set()
+
+    def add_frame(self, now, render_time, overflow, extents):
+        """
+        Record one rendered frame.
+
+        Args:
+            now: Virtual time of the frame
+            render_time: Wall-clock seconds spent in DisplayManager.render()
+            overflow: Rows reported in DisplayManager.overflow
+            extents: DisplayManager.row_extents after the render
+        """
+        if self.start_time is None:
+            self.start_time = now
+        self.end_time = now
+        self.frames += 1
+        self.render_times.append(render_time)
+
+        if overflow:
+            self.overflow_frames += 1
+        for row in overflow:
+            if row not in self._overflowing:
+                self.overflow_events.append((now, row, extents[row]))
+        self._overflowing = set(overflow)
+
+    def summary(self):
+        """
+        Format the report for printing.
+
+        Returns:
+            str: Multi-line human-readable summary
+        """
+        if not self.frames:
+            return "No frames replayed."
+        times = sorted(self.render_times)
+        total = sum(times)
+        lines = [
+            f"Frames: {self.frames} covering {self.end_time - self.start_time:.0f}s "
+            f"of recorded time, replayed in {total:.2f}s of render time "
+            f"({self.skipped_ticks} unchanged ticks skipped)",
+            "Render cost per frame: mean {:.3f}ms p50 {:.3f}ms p99 {:.3f}ms max {:.3f}ms".format(
+                total / self.frames * 1000,
+                times[len(times) // 2] * 1000,
+                times[min(len(times) - 1, int(len(times) * 0.99))] * 1000,
+                times[-1] * 1000,
+            ),
+            f"Frames with layout overflow: {self.overflow_frames}",
+        ]
+        for now, row, extent in self.overflow_events[:MAX_LISTED_EVENTS]:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            lines.append(f"  {stamp} {row} row overflowed (right edge at {extent}px)")
+        if len(self.overflow_events) > MAX_LISTED_EVENTS:
+            lines.append(f"  ... {len(self.overflow_events) - MAX_LISTED_EVENTS} more overflow events")
+        if self.unknown_widgets:
+            lines.append("Widgets in trace but not on display: " + ", ".join(sorted(self.unknown_widgets)))
+        return "\n".join(lines)
+
+def replay_trace(path, display, clock=None):
+    """
+    Feed a trace into a display manager as fast as possible.
+
+    Widget values are restored with set_state() instead of calling update(), then
+    the display is rendered and timed. Ticks where no value changed would produce
+    the previous frame again and are skipped. Use a headless device
+    (luma.core.device.dummy) to replay without hardware.
+
+    Args:
+        path: Trace file written by TraceRecorder
+        display: DisplayManager with the same widgets as the recorded service
+        clock: VirtualClock advanced to each recorded tick (default: a new one)
+
+    Returns:
+        ReplayReport: Render timings and overflow events
+    """
+    clock = clock or VirtualClock()
+    display.clock = clock
+    report = ReplayReport()
+    for now, states in read_trace(path):
+        clock.set(now)
+        if not states and report.frames:
+            report.skipped_ticks += 1
+            continue
+        for name, state in states.items():
+            widget = display.widgets.get(name)
+            if widget is None:
+                report.unknown_widgets.add(name)
+                continue
+            widget.set_state(state)
+
+        started = time.perf_counter()
+        display.render()
+        report.add_frame(now, time.perf_counter() - started, display.overflow, display.row_extents)
+    return report
@@ -9,9 +9,39 @@ class BaseWidget(ABC):
     """
     Abstract base class for all widgets.
     """
+    # Attributes holding the collected values (exported in snapshots, restored on replay)
+    STATE_FIELDS = ()
+    # Unique name assigned by DisplayManager when the widget is added
+    name = None
+
     def __init__(self):
         """Initialize the widget."""
         pass
+
+    def get_state(self):
+        """
+        Return the values collected by the last update().
+
+        Returns:
+            dict: Mapping of STATE_FIELDS names to their current values
+        """
+        state = {}
+        for field in self.STATE_FIELDS:
+            value = getattr(self, field)
+            # Copy lists so later in-place updates do not change the snapshot
+            state[field] = list(value) if isinstance(value, list) else value
+        return state
+
+    def set_state(self, state):
+        """
+        Restore collected values without calling update().
+
+        Args:
+            state: Mapping of STATE_FIELDS names to values, as from get_state()
+        """
+        for field in self.STATE_FIELDS:
+            if field in state:
+                setattr(self, field, state[field])
         
     @abstractmethod
     def update(self):
@@ -39,6 +69,8 @@ class ResourceWidget(BaseWidget):
     """
     Base class for resource widgets (CPU, RAM, Temp) showing icon + value.
     """
+    STATE_FIELDS = ("value",)
+
     def __init__(self, icon_char, font_path=None):
         """
         Initialize a resource widget.
@@ -100,6 +132,8 @@ class ServiceWidget(BaseWidget):
     """
     Base class for service widgets (Docker, Ceph) showing icon if active.
     """
+    STATE_FIELDS = ("active",)
+
     def __init__(self, icon_char, font_path=None):
         """
         Initialize a service widget.
@@ -155,6 +189,8 @@ class TextWidget(BaseWidget):
     """
     Base class for text widgets (hostname, IP address).
     """
+    STATE_FIELDS = ("text",)
+
     CASE_ORIGINAL = 0
     CASE_UPPER = 1
     CASE_LOWER = 2
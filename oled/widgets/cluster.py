@@ -0,0 +1,82 @@
+"""
+ClusterSummaryWidget: Displays aggregate stats of peer nodes.
+ClusterNodeWidget: Cycles through peer nodes one at a time.
+"""
+from .base import TextWidget
+
+class ClusterSummaryWidget(TextWidget):
+    """
+    Widget to display the peer count, average CPU and hottest temperature,
+    e.g. "4N 37% 62°".
+    """
+    STATE_FIELDS = TextWidget.STATE_FIELDS + ("node_count",)
+
+    def __init__(self, table):
+        """
+        Initialize the summary widget.
+
+        Args:
+            table: oled.cluster.ClusterTable receiving the peer stats
+        """
+        super().__init__(
+            text="0N",
+            font_size=10,
+            case_mode=TextWidget.CASE_ORIGINAL,
+            bold=False
+        )
+        self.table = table
+        self.node_count = 0
+
+    def update(self):
+        # Receive pending peer packets and drop silent peers
+        self.table.poll()
+        nodes = self.table.nodes()
+        self.node_count = len(nodes)
+        if not nodes:
+            self.text = "0N"
+            return
+        cpu = sum(node.cpu for node in nodes) / len(nodes)
+        temp = max(node.temp for node in nodes)
+        self.text = f"{len(nodes)}N {int(cpu)}% {int(temp)}°"
+
+class ClusterNodeWidget(TextWidget):
+    """
+    Widget to display one peer node at a time, e.g. "NODE2 12% 48°",
+    moving to the next peer every few updates.
+    """
+    def __init__(self, table, rotate_every=3):
+        """
+        Initialize the rotating node widget.
+
+        Args:
+            table: oled.cluster.ClusterTable receiving the peer stats
+            rotate_every: Number of updates each node stays on screen
+        """
+        super().__init__(
+            text="",
+            font_size=10,
+            case_mode=TextWidget.CASE_UPPER,
+            bold=False
+        )
+        self.table = table
+        self.rotate_every = rotate_every
+        self._ticks = 0
+        self._index = 0
+
+    def update(self):
+        # Receive pending peer packets and drop silent peers
+        self.table.poll()
+        nodes = self.table.nodes()
+        if not nodes:
+            self.text = "no peers"
+            return
+
+        self._ticks += 1
+        if self._ticks >= self.rotate_every:
+            self._ticks = 0
+            self._index += 1
+        # Nodes may have expired since the last update, so wrap the index every time
+        self._index %= len(nodes)
+
+        node = nodes[self._index]
+        self.text = f"{node.hostname} {node.cpu}% {int(node.temp)}°"
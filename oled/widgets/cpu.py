@@ -1,8 +1,18 @@
 """
 CPUWidget: Displays CPU usage percentage with BoxIcon.
+CPUCoresWidget: Displays per-core CPU usage as a bar graph.
 """
+import re
 import psutil
+from PIL import Image, ImageChops
 from .base import ResourceWidget
+from ..procfs import ProcFile
+
+# Maps any non-zero difference to "on" when converting the bar mask to mode "1"
+BAR_MASK_LUT = [0] + [255] * 255
+
+# "cpu  user nice system idle iowait irq softirq steal ..." followed by one "cpuN ..." line per core
+STAT_CPU_PATTERN = re.compile(rb"^cpu(\d*) +(\d+) (\d+) (\d+) (\d+) (\d+) (\d+) (\d+) (\d+)", re.MULTILINE)
 
 class CPUWidget(ResourceWidget):
     """
@@ -16,3 +26,171 @@ class CPUWidget(ResourceWidget):
     def update(self):
         # Get CPU usage percentage
         self.value = psutil.cpu_percent(interval=None)
+
+class CPUCoresWidget(ResourceWidget):
+    """
+    Widget to display one usage bar per CPU core next to the CPU icon.
+    A single pegged core stays visible even when the aggregate usage is low.
+    """
+    STATE_FIELDS = ResourceWidget.STATE_FIELDS + ("percents",)
+
+    def __init__(self, bar_area_width=32, bar_height=12):
+        """
+        Initialize the per-core widget.
+
+        Args:
+            bar_area_width: Horizontal space for all bars in pixels
+            bar_height: Height of a full (100%) bar in pixels
+        """
+        # CPU icon from BoxIcons (bxs-chip)
+        super().__init__(icon_char=chr(0xED45))
+        self.value = 0
+        self.percents = []
+        self.bar_area_width = bar_area_width
+        self.bar_height = bar_height
+
+        self._proc = ProcFile("/proc/stat")
+        # Previous busy/total jiffies and read generation, keyed by cpu id (-1 for the aggregate line)
+        self._jiffies = {}
+        self._generation = 0
+        self._levels = bytearray()
+        self._threshold = None  # Cached threshold image for the current column count
+
+    def update(self):
+        # Read all per-core counters with a single read
+        try:
+            matches = self._proc.finditer(STAT_CPU_PATTERN)
+        except OSError:
+            return
+
+        self._generation += 1
+        generation = self._generation
+        core = 0
+        for match in matches:
+            cpu = match.group(1)
+            index = int(cpu) if cpu else -1
+            # Guest time is already included in user/nice
+            fields = map(int, match.group(2, 3, 4, 5, 6, 7, 8, 9))
+            user, nice, system, idle, iowait, irq, softirq, steal = fields
+            total = user + nice + system + idle + iowait + irq + softirq + steal
+            busy = total - idle - iowait
+
+            # Compare each core only against its own previous reading; a core that was
+            # offline during the last read has no baseline yet
+            entry = self._jiffies.get(index)
+            if entry is None:
+                entry = self._jiffies[index] = [busy, total, generation]
+                percent = 0.0
+            else:
+                elapsed = total - entry[1]
+                if entry[2] == generation - 1 and elapsed > 0:
+                    percent = 100.0 * (busy - entry[0]) / elapsed
+                else:
+                    percent = 0.0
+                entry[0] = busy
+                entry[1] = total
+                entry[2] = generation
+
+            if index < 0:
+                self.value = percent
+                continue
+            # Online cores are listed in id order, one bar each
+            if core < len(self.percents):
+                self.percents[core] = percent
+            else:
+                self.percents.append(percent)
+            core += 1
+
+        # Cores taken offline disappear from /proc/stat
+        del self.percents[core:]
+        if len(self._jiffies) > core + 1:
+            stale = [index for index, entry in self._jiffies.items() if entry[2] != generation]
+            for index in stale:
+                del self._jiffies[index]
+
+    def _columns(self, count):
+        """Number of bars drawn for `count` cores; at most one per pixel of the bar area."""
+        return min(count, self.bar_area_width)
+
+    def _bar_geometry(self, count):
+        """
+        Fit the bars into the bar area for the given bar count.
+
+        Returns:
+            tuple: (pitch, bar_width) in pixels; pitch includes the 1px gap if there is room
+        """
+        pitch = max(1, self.bar_area_width // count)
+        gap = 1 if pitch >= 2 else 0
+        return pitch, pitch - gap
+
+    def _threshold_image(self, count):
+        """
+        Build (and cache) the per-pixel threshold image for all bars.
+
+        Row y lights up when a bar's level exceeds its threshold; gap columns use
+        the maximum threshold so they never light up.
+        """
+        if self._threshold is not None and self._threshold[0] == count:
+            return self._threshold[1]
+
+        pitch, bar_width = self._bar_geometry(count)
+        height = self.bar_height
+        row_width = count * pitch
+        data = bytearray(row_width * height)
+        for y in range(height):
+            level = (height - 1 - y) * 255 // height
+            row = (bytes([level]) * bar_width + b"\xff" * (pitch - bar_width)) * count
+            data[y * row_width:(y + 1) * row_width] = row
+        image = Image.frombytes("L", (row_width, height), bytes(data))
+        self._threshold = (count, image)
+        return image
+
+    def render(self, draw, x, y, width, align_right=False):
+        """
+        Draw the icon followed by one vertical bar per core.
+
+        Args:
+            draw: PIL.ImageDraw object
+            x: Current x position (horizontal)
+            y: Current y position (vertical)
+            width: Total display width
+            align_right: If True, position from right edge (ignored for ResourceWidget)
+
+        Returns:
+            tuple: Updated (x, y) position for next widget
+        """
+        # Draw icon
+        draw.text((x, y), self.icon_char, font=self.icon_font, fill=255)
+
+        # Calculate icon width
+        try:
+            icon_width = self.icon_font.getbbox(self.icon_char)[2]
+        except AttributeError:
+            icon_width = 12  # Fallback width
+
+        count = len(self.percents)
+        if not count:
+            return (x + icon_width + 5, y)
+
+        # Scale each core's usage to a 0-255 level (one byte per bar). With more
+        # cores than pixels, neighbouring cores share a bar showing the busiest one.
+        columns = self._columns(count)
+        if len(self._levels) != columns:
+            self._levels = bytearray(columns)
+        elif columns < count:
+            self._levels[:] = bytes(columns)
+        for i, percent in enumerate(self.percents):
+            column = i * columns // count
+            level = min(255, max(0, int(percent * 2.55 + 0.5)))
+            if columns == count or level > self._levels[column]:
+                self._levels[column] = level
+
+        # Stretch the levels to bar width/height and compare against the thresholds,
+        # producing the mask for every bar in a handful of C-level image operations
+        threshold = self._threshold_image(columns)
+        levels = Image.frombytes("L", (columns, 1), bytes(self._levels))
+        levels = levels.resize(threshold.size, Image.NEAREST)
+        mask = ImageChops.subtract(levels, threshold).point(BAR_MASK_LUT, "1")
+        draw.bitmap((x + icon_width + 1, y), mask, fill=255)
+
+        return (x + icon_width + 1 + threshold.size[0] + 5, y)
@@ -1,8 +1,16 @@
 """
 IPAddressWidget: Displays the device IP address.
+NetworkThroughputWidget: Displays network receive/transmit rates.
 """
+import os
+import re
 import socket
+import time
 from .base import TextWidget
+from ..rates import CounterSource, format_rate
+
+# "  eth0: rx_bytes rx_packets ... (8 receive columns) tx_bytes ..."
+NET_DEV_PATTERN = re.compile(rb"^\s*([^\s:]+):\s*(\d+)(?:\s+\d+){7}\s+(\d+)", re.MULTILINE)
 
 class IPAddressWidget(TextWidget):
     """
@@ -35,3 +43,75 @@ class IPAddressWidget(TextWidget):
     def update(self):
         # Refresh the IP address
         self.text = self._get_ip()
+
+class NetworkCounters(CounterSource):
+    """
+    Per-interface byte counters from /proc/net/dev, shareable between widgets.
+    """
+    def __init__(self, interfaces=None, alpha=0.5, clock=time.monotonic):
+        """
+        Initialize the counters.
+
+        Args:
+            interfaces: Interface names to track (default: all physical interfaces)
+            alpha: EWMA smoothing weight of the newest sample
+            clock: Monotonic time source in seconds
+        """
+        self.interfaces = {name.encode() for name in interfaces} if interfaces else None
+        super().__init__("/proc/net/dev", NET_DEV_PATTERN, self._is_included, alpha=alpha, clock=clock)
+
+    def _is_included(self, name):
+        """
+        Decide whether an interface is counted.
+        Without an explicit list, only interfaces backed by a device are counted,
+        which skips loopback, bridges and container veth pairs.
+        """
+        if self.interfaces is not None:
+            return name in self.interfaces
+        return os.path.exists(f"/sys/class/net/{name.decode()}/device")
+
+class NetworkThroughputWidget(TextWidget):
+    """
+    Widget to display network receive/transmit rates from /proc/net/dev,
+    summed over all counted interfaces or for a single one.
+    """
+    STATE_FIELDS = TextWidget.STATE_FIELDS + ("rx_rate", "tx_rate")
+
+    def __init__(self, interface=None, interfaces=None, alpha=0.5, clock=time.monotonic, source=None):
+        """
+        Initialize the throughput widget.
+
+        Args:
+            interface: Show only this interface, prefixed with its name (default: the total)
+            interfaces: Interface names to count (default: all physical interfaces,
+                or just `interface` if given)
+            alpha: EWMA smoothing weight of the newest sample
+            clock: Monotonic time source in seconds
+            source: NetworkCounters shared with other widgets (default: a private one)
+        """
+        super().__init__(
+            text="",
+            font_size=10,
+            case_mode=TextWidget.CASE_ORIGINAL,
+            bold=False
+        )
+        if source is None:
+            if interface and not interfaces:
+                interfaces = [interface]
+            source = NetworkCounters(interfaces, alpha=alpha, clock=clock)
+        self.source = source
+        self.interface = interface
+        self.rx_rate = 0.0
+        self.tx_rate = 0.0
+
+    def update(self):
+        # Read all interface counters (once per tick, even if shared)
+        try:
+            self.source.refresh()
+        except OSError:
+            self.text = "net n/a"
+            return
+
+        self.rx_rate, self.tx_rate = self.source.rates(self.interface)
+        prefix = f"{self.interface} " if self.interface else ""
+        self.text = f"{prefix}↓{format_rate(self.rx_rate)} ↑{format_rate(self.tx_rate)}"
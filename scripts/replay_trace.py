@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Replay a trace recorded with run_oled_service.py --record on a headless display.
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from luma.core.device import dummy
+
+from oled.display_manager import DisplayManager
+from oled.cluster import ClusterTable
+from oled.layout import BOTTOM_WIDGETS, add_default_widgets
+from oled.trace import replay_trace
+
+def main():
+    """
+    Build the standard layout on a dummy device, replay the trace and print the report.
+    """
+    parser = argparse.ArgumentParser(description='Replay an OLED metric trace offline')
+    parser.add_argument('trace', help='Trace file written with --record')
+    parser.add_argument('--cluster-view', choices=['summary', 'nodes'],
+                        help='The trace was recorded on a cluster display with this view')
+    parser.add_argument('--per-core-cpu', action='store_true',
+                        help='The trace was recorded with --per-core-cpu')
+    parser.add_argument('--bottom-widget', choices=BOTTOM_WIDGETS, default='ip',
+                        help='The trace was recorded with this --bottom-widget (default: ip)')
+    parser.add_argument('--save-frames', metavar='DIR',
+                        help='Write every frame that overflowed as a PNG into this directory')
+    args = parser.parse_args()
+
+    display = DisplayManager(device=dummy(width=128, height=32, mode="1"))
+    # An unbound table never receives packets; the recorded text is restored instead
+    cluster_table = ClusterTable() if args.cluster_view else None
+    add_default_widgets(display, cluster_table, args.cluster_view or "summary",
+                        per_core_cpu=args.per_core_cpu, bottom_widget=args.bottom_widget)
+
+    if args.save_frames:
+        os.makedirs(args.save_frames, exist_ok=True)
+        render = display.render
+
+        def render_and_save():
+            render()
+            if display.overflow:
+                path = os.path.join(args.save_frames, f"{display.clock():.3f}.png")
+                display.device.image.save(path)
+
+        display.render = render_and_save
+
+    report = replay_trace(args.trace, display)
+    print(report.summary())
+
+if __name__ == "__main__":
+    main()
@@ -11,16 +11,47 @@ import argparse
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  
 
 from oled.display_manager import DisplayManager
+from oled.export import SnapshotServer
+from oled.cluster import ClusterTable, PushAgent, parse_address
+from oled.layout import BOTTOM_WIDGETS, add_default_widgets
+from oled.trace import TraceRecorder
+from oled.profiler import install_signal_handlers
 from oled.system_checks import check_i2c_enabled, check_oled_connected, check_root_user
 
-# Import all widgets
+# Widgets collected by headless peers
 from oled.widgets.cpu import CPUWidget
 from oled.widgets.ram import RAMWidget
 from oled.widgets.temp import TempWidget
 from oled.widgets.docker import DockerWidget
 from oled.widgets.ceph import CephWidget
-from oled.widgets.network import IPAddressWidget
-from oled.widgets.hostname import HostnameWidget
+
+def run_push_agent(address):
+    """
+    Headless peer mode - collect the same stats as the display and push them
+    to the display node over UDP once per second.
+    """
+    widgets = {
+        "CPUWidget": CPUWidget(),
+        "RAMWidget": RAMWidget(),
+        "TempWidget": TempWidget(),
+        "DockerWidget": DockerWidget(),
+        "CephWidget": CephWidget(),
+    }
+    agent = PushAgent(address)
+    try:
+        print(f"Pushing stats to {address[0]}:{address[1]}. Press Ctrl+C to exit.")
+        while True:
+            for widget in widgets.values():
+                widget.update()
+            agent.send({
+                "time": time.time(),
+                "widgets": {name: widget.get_state() for name, widget in widgets.items()},
+            })
+            time.sleep(1)
+    except KeyboardInterrupt:
+        print("Exiting...")
+    finally:
+        agent.close()
 
 def main():
     """
@@ -28,7 +59,34 @@ def main():
     """
     parser = argparse.ArgumentParser(description='OLED Stats Display')
     parser.add_argument('--dev', action='store_true', help='Development mode (bypass hardware checks)')
+    parser.add_argument('--metrics-socket', metavar='PATH',
+                        help='Publish widget snapshots as JSON lines on this Unix socket')
+    parser.add_argument('--push', metavar='HOST[:PORT]',
+                        help='Headless peer mode: push stats to the display node at this address')
+    parser.add_argument('--cluster-listen', metavar='[HOST:]PORT',
+                        help='Receive stats pushed by peer nodes on this UDP address')
+    parser.add_argument('--cluster-view', choices=['summary', 'nodes'], default='summary',
+                        help='Show a cluster summary or rotate through peer nodes (default: summary)')
+    parser.add_argument('--per-core-cpu', action='store_true',
+                        help='Show one usage bar per CPU core instead of the aggregate percentage')
+    parser.add_argument('--bottom-widget', choices=BOTTOM_WIDGETS, default='ip',
+                        help='Widget next to the hostname: IP address or network/disk throughput (default: ip)')
+    parser.add_argument('--device', metavar='NAME',
+                        help='Interface or block device shown by --bottom-widget network/disk (default: total)')
+    parser.add_argument('--record', metavar='PATH',
+                        help='Append the collected widget values to a trace file for offline replay')
+    parser.add_argument('--record-max-mb', type=float, default=16,
+                        help='Rotate the trace to PATH.1 at this size in MiB, 0 to disable (default: 16)')
+    parser.add_argument('--profile-seconds', type=float, default=30,
+                        help='Length of the profile started by SIGUSR1 (default: 30)')
+    parser.add_argument('--profile-dir', default='/tmp',
+                        help='Directory for collapsed-stack profiles (default: /tmp)')
     args = parser.parse_args()
+
+    # Peers without a display only collect and push their stats
+    if args.push:
+        run_push_agent(parse_address(args.push))
+        return
     
     dev_mode = args.dev
     
@@ -51,18 +109,40 @@ def main():
     # using default I2C port 1 and address 0x3C
     display = DisplayManager()
     
-    # Add resource widgets for top row (CPU, RAM, Temperature)
-    display.add_resource_widget(CPUWidget())
-    display.add_resource_widget(RAMWidget())
-    display.add_resource_widget(TempWidget())
-    
-    # Add service widgets for top row (Docker, Ceph)
-    display.add_service_widget(DockerWidget())
-    display.add_service_widget(CephWidget())
-    
-    # Add text widgets for bottom row (Hostname, IP)
-    display.add_text_widget(HostnameWidget())
-    display.add_text_widget(IPAddressWidget())
+    # Receive stats from peer nodes if running as the cluster display
+    cluster_table = None
+    if args.cluster_listen:
+        cluster_table = ClusterTable()
+        cluster_table.bind(parse_address(args.cluster_listen))
+
+    # CPU, RAM, Temperature and Docker, Ceph on top; hostname and IP (or cluster view) below
+    add_default_widgets(display, cluster_table, args.cluster_view,
+                        per_core_cpu=args.per_core_cpu, bottom_widget=args.bottom_widget,
+                        device=args.device)
+
+    # Share collected samples with co-located agents
+    metrics_server = None
+    if args.metrics_socket:
+        metrics_server = SnapshotServer(args.metrics_socket)
+        try:
+            metrics_server.start()
+        except OSError as e:
+            print(f"Error: Cannot create metrics socket: {e}")
+            sys.exit(1)
+        display.add_listener(metrics_server.publish)
+
+    # Record collected values for scripts/replay_trace.py
+    recorder = None
+    if args.record:
+        try:
+            recorder = TraceRecorder(args.record, max_bytes=int(args.record_max_mb * 1048576))
+        except OSError as e:
+            print(f"Error: Cannot open trace file: {e}")
+            sys.exit(1)
+        display.add_listener(recorder.record)
+
+    # SIGUSR1 profiles the loop for a while, SIGUSR2 prints per-widget timings
+    install_signal_handlers(display, duration=args.profile_seconds, output_dir=args.profile_dir)
     
     try:
         print("OLED stats display running. Press Ctrl+C to exit.")
@@ -74,6 +154,13 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        if metrics_server:
+            metrics_server.close()
+        if cluster_table:
+            cluster_table.close()
+        if recorder:
+            recorder.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Soak benchmark: run weeks of display ticks at full speed on a dummy device and
+fail if memory keeps growing.
+"""
+import sys
+import os
+import argparse
+import shutil
+import socket
+import tempfile
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from luma.core.device import dummy
+
+from oled.cluster import ClusterTable, PushAgent
+from oled.display_manager import DisplayManager
+from oled.export import SnapshotServer
+from oled.layout import add_default_widgets
+from oled.soak import run_soak, stub_service_probes
+from oled.trace import TraceRecorder, VirtualClock
+from oled.widgets.cpu import CPUCoresWidget
+from oled.widgets.network import NetworkThroughputWidget
+from oled.widgets.disk import DiskThroughputWidget
+
+def drain_socket(path):
+    """Connect to the metrics socket and discard everything it sends until it closes."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(path)
+
+    def read():
+        with client:
+            while client.recv(65536):
+                pass
+
+    threading.Thread(target=read, name="soak-metrics-client", daemon=True).start()
+
+def add_listeners(display, clock, directory):
+    """
+    Attach the optional service features: metrics socket with a connected client,
+    a size-capped trace recorder and a cluster peer pushing to a loopback table.
+
+    Returns:
+        tuple: (ClusterTable for the layout, list of close callables)
+    """
+    metrics_server = SnapshotServer(os.path.join(directory, "metrics.sock"))
+    metrics_server.start()
+    drain_socket(metrics_server.path)
+    display.add_listener(metrics_server.publish)
+
+    # A small cap rotates the trace regularly, so rotation is soaked too
+    recorder = TraceRecorder(os.path.join(directory, "soak.trace"), max_bytes=1 << 20)
+    display.add_listener(recorder.record)
+
+    cluster_table = ClusterTable(clock=clock)
+    cluster_table.bind(("127.0.0.1", 0))
+    agent = PushAgent(cluster_table.sock.getsockname(), hostname="soak-peer")
+    display.add_listener(agent.send)
+
+    return cluster_table, [metrics_server.close, recorder.close, agent.close, cluster_table.close]
+
+def main():
+    """
+    Build the standard layout on a dummy device, run the soak and exit non-zero on failure.
+    """
+    parser = argparse.ArgumentParser(description='OLED service memory soak test')
+    parser.add_argument('--ticks', type=int, default=7 * 86400,
+                        help='Update/render cycles to run (default: one week of 1s ticks)')
+    parser.add_argument('--warmup', type=int, default=1000,
+                        help='Ticks before the baseline sample (default: 1000)')
+    parser.add_argument('--sample-every', type=int, default=10000,
+                        help='Ticks between memory samples (default: 10000)')
+    parser.add_argument('--traced-ticks', type=int,
+                        help='Cycles run under tracemalloc after the RSS run (default: a tenth of --ticks)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Growing allocation sites to report (default: 10)')
+    parser.add_argument('--max-rss-growth-kb', type=int, default=4096,
+                        help='Fail if RSS grows by more than this after warmup (default: 4096)')
+    parser.add_argument('--max-traced-growth-kb', type=int, default=1024,
+                        help='Fail if Python allocations grow by more than this (default: 1024)')
+    parser.add_argument('--extended', action='store_true',
+                        help='Also include the per-core CPU and network/disk throughput widgets')
+    parser.add_argument('--real-services', action='store_true',
+                        help='Run the real systemctl/docker/ceph probes instead of stubs (much slower)')
+    parser.add_argument('--no-listeners', action='store_true',
+                        help='Leave out the metrics socket, trace recorder and cluster push/receive')
+    args = parser.parse_args()
+
+    clock = VirtualClock()
+    display = DisplayManager(device=dummy(width=128, height=32, mode="1"), clock=clock)
+    directory = tempfile.mkdtemp(prefix="rpi-oled-soak-")
+    cluster_table, closers = None, []
+    if not args.no_listeners:
+        cluster_table, closers = add_listeners(display, clock, directory)
+    add_default_widgets(display, cluster_table)
+    if args.extended:
+        display.add_resource_widget(CPUCoresWidget())
+        display.add_text_widget(NetworkThroughputWidget(clock=clock))
+        display.add_text_widget(DiskThroughputWidget(clock=clock))
+    if not args.real_services:
+        stub_service_probes(display)
+
+    try:
+        report = run_soak(
+            display, clock, args.ticks,
+            warmup=args.warmup,
+            sample_every=args.sample_every,
+            traced_ticks=args.traced_ticks,
+            top=args.top,
+            max_rss_growth=args.max_rss_growth_kb * 1024,
+            max_traced_growth=args.max_traced_growth_kb * 1024,
+        )
+    finally:
+        for close in closers:
+            close()
+        shutil.rmtree(directory, ignore_errors=True)
+    print(report.summary())
+    sys.exit(0 if report.passed else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Tests for cluster mode: packet encoding, the peer table and loopback delivery.
+"""
+import socket
+import time
+
+from oled.cluster import (
+    MAX_HOSTNAME, MAX_PACKET, REORDER_WINDOW, SEQUENCE_MODULUS,
+    ClusterTable, PushAgent, decode_stats, encode_stats,
+)
+from oled.trace import VirtualClock
+
+def stats(hostname, sequence, cpu=10):
+    return (hostname, sequence, cpu, 20, 45.5, True, False)
+
+def snapshot(cpu=12.4, ram=56.6, temp=48.25, docker=True, ceph=False):
+    return {"widgets": {
+        "CPUWidget": {"value": cpu},
+        "RAMWidget": {"value": ram},
+        "TempWidget": {"value": temp},
+        "DockerWidget": {"active": docker},
+        "CephWidget": {"active": ceph},
+    }}
+
+def test_encode_decode_roundtrip():
+    packet = encode_stats("node-1", 42, 12.4, 56.6, 48.25, docker=True, ceph=False)
+    assert len(packet) <= MAX_PACKET
+    assert decode_stats(packet) == ("node-1", 42, 12, 57, 48.2, True, False)
+
+def test_encode_clamps_values():
+    packet = encode_stats("n" * (MAX_HOSTNAME + 10), SEQUENCE_MODULUS + 1, 140, -3, 4000.0)
+    hostname, sequence, cpu, ram, temp, docker, ceph = decode_stats(packet)
+    assert len(hostname) == MAX_HOSTNAME
+    assert (sequence, cpu, ram, temp) == (1, 100, 0, 3276.7)
+    assert (docker, ceph) == (False, False)
+
+def test_decode_rejects_malformed_packets():
+    packet = encode_stats("node-1", 1, 0, 0, 0.0)
+    assert decode_stats(packet[:5]) is None
+    assert decode_stats(b"XX" + packet[2:]) is None
+    assert decode_stats(packet[:-1]) is None
+
+def test_apply_drops_duplicates_and_reordered_packets():
+    table = ClusterTable(clock=VirtualClock())
+    assert table.apply(stats("a", 10))
+    assert not table.apply(stats("a", 10))
+    assert not table.apply(stats("a", 9))
+    assert table.apply(stats("a", 11, cpu=99))
+    assert table.nodes()[0].cpu == 99
+
+def test_apply_accepts_sequence_wrap():
+    table = ClusterTable(clock=VirtualClock())
+    assert table.apply(stats("a", SEQUENCE_MODULUS - 1))
+    assert table.apply(stats("a", 0))
+
+def test_apply_accepts_restarted_peer():
+    table = ClusterTable(clock=VirtualClock())
+    assert table.apply(stats("a", 5000))
+    assert table.apply(stats("a", 5000 - REORDER_WINDOW - 1))
+    assert table.nodes()[0].sequence == 5000 - REORDER_WINDOW - 1
+
+def test_silent_peers_expire():
+    clock = VirtualClock()
+    table = ClusterTable(ttl=10.0, clock=clock)
+    table.apply(stats("a", 1))
+    clock.advance(5.0)
+    table.apply(stats("b", 1))
+    clock.advance(6.0)
+    table.poll()
+    assert [node.hostname for node in table.nodes()] == ["b"]
+    clock.advance(5.0)
+    table.poll()
+    assert table.nodes() == []
+
+def test_full_table_evicts_oldest_peer():
+    clock = VirtualClock()
+    table = ClusterTable(capacity=3, clock=clock)
+    for hostname in ("a", "b", "c"):
+        table.apply(stats(hostname, 1))
+        clock.advance(1.0)
+    table.apply(stats("a", 2))  # "b" is now the peer heard from longest ago
+    table.apply(stats("d", 1))
+    assert [node.hostname for node in table.nodes()] == ["a", "c", "d"]
+
+def test_push_agent_to_table_over_loopback():
+    table = ClusterTable()
+    table.bind(("127.0.0.1", 0))
+    port = table.sock.getsockname()[1]
+    agent = PushAgent(("localhost", port), hostname="peer-1")
+    try:
+        agent.send(snapshot())
+        agent.send(snapshot(cpu=80.0))
+        deadline = time.monotonic() + 2.0
+        applied = 0
+        while applied < 2 and time.monotonic() < deadline:
+            applied += table.poll()
+            time.sleep(0.01)
+        nodes = table.nodes()
+        assert [node.hostname for node in nodes] == ["peer-1"]
+        assert (nodes[0].sequence, nodes[0].cpu, nodes[0].ram) == (2, 80, 57)
+        assert nodes[0].docker and not nodes[0].ceph
+    finally:
+        agent.close()
+        table.close()
+
+def test_push_agent_resolves_once(monkeypatch):
+    lookups = []
+    getaddrinfo = socket.getaddrinfo
+
+    def counting_getaddrinfo(*args, **kwargs):
+        lookups.append(args[0])
+        return getaddrinfo(*args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting_getaddrinfo)
+    agent = PushAgent(("localhost", 9), hostname="peer-1")
+    try:
+        for _ in range(5):
+            agent.send(snapshot())
+    finally:
+        agent.close()
+    assert lookups == ["localhost"]
+
+def test_push_agent_retries_failed_lookup_after_interval(monkeypatch):
+    clock = VirtualClock()
+    lookups = []
+
+    def failing_getaddrinfo(host, *args, **kwargs):
+        lookups.append(host)
+        raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+
+    monkeypatch.setattr(socket, "getaddrinfo", failing_getaddrinfo)
+    agent = PushAgent(("display-node", 9), hostname="peer-1", clock=clock)
+    try:
+        agent.send(snapshot())
+        assert len(lookups) == 1
+        clock.advance(61.0)
+        agent.send(snapshot())
+        assert len(lookups) == 2
+    finally:
+        agent.close()
@@ -0,0 +1,101 @@
+"""
+Tests for the per-core CPU widget using a fake /proc/stat.
+"""
+from PIL import Image, ImageDraw
+
+from oled.procfs import ProcFile
+from oled.widgets.cpu import CPUCoresWidget
+
+def stat_line(name, busy, idle):
+    # user nice system idle iowait irq softirq steal guest guest_nice
+    return b"%s %d 0 0 %d 0 0 0 0 0 0\n" % (name, busy, idle)
+
+def write_stat(path, cores):
+    """Write a /proc/stat with an aggregate line and one line per online core."""
+    busy = sum(core_busy for core_busy, _ in cores.values())
+    idle = sum(core_idle for _, core_idle in cores.values())
+    data = stat_line(b"cpu ", busy, idle)
+    for index, (core_busy, core_idle) in sorted(cores.items()):
+        data += stat_line(b"cpu%d" % index, core_busy, core_idle)
+    path.write_bytes(data + b"intr 12345 0 0\nctxt 6789\n")
+
+def make_widget(path, **kwargs):
+    widget = CPUCoresWidget(**kwargs)
+    widget._proc = ProcFile(str(path))
+    return widget
+
+def test_per_core_and_aggregate_percent(tmp_path):
+    path = tmp_path / "stat"
+    widget = make_widget(path)
+    write_stat(path, {0: (0, 0), 1: (0, 0), 2: (0, 0)})
+    widget.update()
+    assert widget.percents == [0.0, 0.0, 0.0]
+    write_stat(path, {0: (100, 0), 1: (0, 100), 2: (50, 50)})
+    widget.update()
+    assert widget.percents == [100.0, 0.0, 50.0]
+    assert widget.value == 50.0
+
+def test_offline_core_does_not_shift_other_cores(tmp_path):
+    path = tmp_path / "stat"
+    widget = make_widget(path)
+    write_stat(path, {0: (0, 0), 1: (0, 0), 2: (0, 0)})
+    widget.update()
+    # Core 1 goes offline: core 2 must still be compared against its own reading
+    write_stat(path, {0: (100, 0), 2: (0, 100)})
+    widget.update()
+    assert widget.percents == [100.0, 0.0]
+    # Core 1 returns without a baseline from the previous read
+    write_stat(path, {0: (150, 50), 1: (500, 500), 2: (100, 100)})
+    widget.update()
+    assert widget.percents == [50.0, 0.0, 100.0]
+    write_stat(path, {0: (150, 150), 1: (600, 500), 2: (100, 200)})
+    widget.update()
+    assert widget.percents == [0.0, 100.0, 0.0]
+
+def test_missed_read_primes_again(tmp_path):
+    path = tmp_path / "stat"
+    widget = make_widget(path)
+    write_stat(path, {0: (0, 0)})
+    widget.update()
+    path.write_bytes(b"")  # no cpu lines in this read
+    widget.update()
+    assert widget.percents == []
+    write_stat(path, {0: (100, 0)})
+    widget.update()
+    assert widget.percents == [0.0]
+
+def render_mask(widget, percents):
+    """Render the widget and return (right edge, lit pixel count per column of the bar area)."""
+    widget.percents = percents
+    image = Image.new("1", (256, 16))
+    right, _ = widget.render(ImageDraw.Draw(image), 0, 0, 256)
+    icon_width = widget.icon_font.getbbox(widget.icon_char)[2]
+    left = icon_width + 1
+    columns = []
+    for x in range(left, left + widget.bar_area_width):
+        columns.append(sum(1 for y in range(16) if image.getpixel((x, y))))
+    # Nothing may be drawn right of the bar area
+    assert all(not image.getpixel((x, y))
+               for x in range(left + widget.bar_area_width, 256) for y in range(16))
+    return right, columns
+
+def test_bars_scale_with_usage(tmp_path):
+    widget = make_widget(tmp_path / "stat", bar_area_width=32, bar_height=12)
+    _, columns = render_mask(widget, [100.0, 0.0, 50.0, 0.0])
+    # Four bars of 7px plus a 1px gap each
+    assert columns[:8] == [12] * 7 + [0]
+    assert columns[8:16] == [0] * 8
+    assert columns[16:24] == [6] * 7 + [0]
+    assert columns[24:32] == [0] * 8
+
+def test_many_cores_stay_inside_bar_area(tmp_path):
+    widget = make_widget(tmp_path / "stat", bar_area_width=32, bar_height=12)
+    extents = set()
+    for count in (4, 16, 32, 48, 64, 256):
+        percents = [0.0] * count
+        percents[-1] = 100.0
+        right, columns = render_mask(widget, percents)
+        extents.add(right)
+        # The busiest core of the last group still shows as a full bar
+        assert max(columns[-2:]) == 12
+    assert len(extents) == 1
@@ -0,0 +1,57 @@
+"""
+Tests for DisplayManager widget bookkeeping and the profiling signal handlers.
+"""
+import os
+import signal
+import time
+
+from luma.core.device import dummy
+
+from oled.display_manager import DisplayManager
+from oled.profiler import install_signal_handlers
+from oled.widgets.base import TextWidget
+
+class CountingWidget(TextWidget):
+    def __init__(self, text):
+        super().__init__(text=text)
+        self.updates = 0
+
+    def update(self):
+        self.updates += 1
+
+def make_display():
+    return DisplayManager(device=dummy(width=128, height=32, mode="1"))
+
+def test_duplicate_widgets_get_unique_names():
+    display = make_display()
+    display.add_text_widget(CountingWidget("a"))
+    display.add_text_widget(CountingWidget("b"))
+    assert list(display.widgets) == ["CountingWidget", "CountingWidget#2"]
+
+def test_directly_appended_widget_is_updated_and_timed():
+    display = make_display()
+    display.add_text_widget(CountingWidget("a"))
+    appended = CountingWidget("b")
+    display.bottom_row_widgets.append(appended)
+    display.update()
+    assert appended.updates == 1
+    assert appended.name == "CountingWidget#2"
+    assert display.timings[appended.name].renders == 1
+
+def test_stats_signal_prints_timings(capsys):
+    display = make_display()
+    display.add_text_widget(CountingWidget("a"))
+    display.update()
+    previous = signal.getsignal(signal.SIGUSR2)
+    try:
+        install_signal_handlers(display)
+        os.kill(os.getpid(), signal.SIGUSR2)
+        deadline = time.monotonic() + 2.0
+        output = ""
+        while "CountingWidget" not in output and time.monotonic() < deadline:
+            time.sleep(0.01)
+            output += capsys.readouterr().out
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+        signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    assert "CountingWidget" in output
@@ -0,0 +1,156 @@
+"""
+Loopback tests for the metrics socket in oled.export.
+"""
+import errno
+import json
+import os
+import shutil
+import socket
+import tempfile
+import time
+
+import pytest
+
+from oled.export import SnapshotServer
+
+@pytest.fixture
+def socket_dir():
+    # Short path: Unix socket paths are limited to about 108 bytes
+    directory = tempfile.mkdtemp(prefix="oled-", dir="/tmp")
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+@pytest.fixture
+def server(socket_dir):
+    server = SnapshotServer(os.path.join(socket_dir, "m.sock"))
+    server.start()
+    yield server
+    server.close()
+
+def snapshot(seq, padding=""):
+    return {"time": float(seq), "widgets": {"CPUWidget": {"value": seq}, "Pad": {"text": padding}}}
+
+def connect(server):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(server.path)
+    return client
+
+class LineReader:
+    """Collects complete JSON lines from a client socket."""
+    def __init__(self, client):
+        self.client = client
+        self.buffer = b""
+
+    def read(self, count=None, timeout=2.0):
+        """Read until `count` lines arrived or nothing more came within `timeout`."""
+        lines = []
+        deadline = time.monotonic() + timeout
+        while count is None or len(lines) < count:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.client.settimeout(remaining)
+            try:
+                data = self.client.recv(65536)
+            except socket.timeout:
+                break
+            if not data:
+                break
+            self.buffer += data
+            *complete, self.buffer = self.buffer.split(b"\n")
+            lines.extend(json.loads(line) for line in complete)
+        return [line["widgets"]["CPUWidget"]["value"] for line in lines]
+
+def test_snapshot_sent_on_connect(server):
+    server.publish(snapshot(1))
+    with connect(server) as client:
+        assert LineReader(client).read(1) == [1]
+
+def test_unchanged_widgets_are_not_sent(server):
+    server.publish(snapshot(1))
+    with connect(server) as client:
+        reader = LineReader(client)
+        assert reader.read(1) == [1]
+        unchanged = snapshot(1)
+        unchanged["time"] = 2.0
+        server.publish(unchanged)
+        assert reader.read(timeout=0.3) == []
+
+def test_one_line_per_change_with_several_clients(server):
+    server.publish(snapshot(0))
+    clients = [connect(server) for _ in range(3)]
+    readers = [LineReader(client) for client in clients]
+    try:
+        for reader in readers:
+            assert reader.read(1) == [0]
+        for seq in range(1, 6):
+            server.publish(snapshot(seq))
+            for reader in readers:
+                assert reader.read(1) == [seq]
+        for reader in readers:
+            assert reader.read(timeout=0.3) == []
+    finally:
+        for client in clients:
+            client.close()
+
+def test_no_duplicates_when_connecting_during_publish(server):
+    for round_number in range(10):
+        base = round_number * 10
+        server.publish(snapshot(base))
+        with connect(server) as client:
+            # Publish while the server may still be accepting the client
+            server.publish(snapshot(base + 1))
+            server.publish(snapshot(base + 2))
+            values = LineReader(client).read(timeout=0.15)
+        assert values == sorted(set(values))
+        assert values[-1] == base + 2
+
+def test_slow_reader_gets_newest_lines_only(socket_dir):
+    server = SnapshotServer(os.path.join(socket_dir, "m.sock"), max_pending=16384)
+    server.start()
+    padding = "x" * 4000
+    try:
+        with connect(server) as client:
+            # Fill the socket buffers and the server queue while the client does not read
+            for seq in range(1, 601):
+                server.publish(snapshot(seq, padding))
+                time.sleep(0.0005)
+            values = LineReader(client).read(timeout=1.0)
+    finally:
+        server.close()
+    # Every received line is complete JSON, in order, without repeats, ending at the newest
+    assert values == sorted(set(values))
+    assert values[-1] == 600
+    assert len(values) < 600
+
+def test_refuses_regular_file(socket_dir):
+    path = os.path.join(socket_dir, "m.sock")
+    with open(path, "w") as f:
+        f.write("keep me")
+    with pytest.raises(OSError) as error:
+        SnapshotServer(path).start()
+    assert error.value.errno == errno.EEXIST
+    with open(path) as f:
+        assert f.read() == "keep me"
+
+def test_refuses_live_socket(server):
+    with pytest.raises(OSError) as error:
+        SnapshotServer(server.path).start()
+    assert error.value.errno == errno.EADDRINUSE
+    server.publish(snapshot(1))
+    with connect(server) as client:
+        assert LineReader(client).read(1) == [1]
+
+def test_replaces_stale_socket(socket_dir):
+    path = os.path.join(socket_dir, "m.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    server = SnapshotServer(path)
+    server.start()
+    try:
+        server.publish(snapshot(1))
+        with connect(server) as client:
+            assert LineReader(client).read(1) == [1]
+    finally:
+        server.close()
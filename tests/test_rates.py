@@ -0,0 +1,143 @@
+"""
+Tests for the counter rate helpers in oled.rates.
+"""
+import mmap
+import re
+
+from oled.rates import COUNTER_32, CounterSource, RateTracker, counter_delta, format_rate
+from oled.procfs import NameCache, ProcFile
+from oled.trace import VirtualClock
+
+PAIR_PATTERN = re.compile(rb"^(\w+) (\d+) (\d+)$", re.MULTILINE)
+
+def make_tracker(alpha=1.0):
+    clock = VirtualClock()
+    return clock, RateTracker(alpha=alpha, clock=clock)
+
+def tick(clock, tracker, **counters):
+    clock.advance(1.0)
+    tracker.begin()
+    for name, (first, second) in counters.items():
+        tracker.sample(name, first, second)
+    tracker.end()
+
+def test_counter_delta_increase():
+    assert counter_delta(150, 100) == 50
+    assert counter_delta(100, 100) == 0
+
+def test_counter_delta_32bit_wrap():
+    assert counter_delta(5, COUNTER_32 - 10) == 15
+
+def test_counter_delta_reset_of_64bit_counter():
+    assert counter_delta(1000, 6000100000) is None
+
+def test_counter_delta_implausible_32bit_wrap_is_reset():
+    assert counter_delta(10, 100000) is None
+
+def test_format_rate():
+    assert format_rate(0) == "0"
+    assert format_rate(999) == "999"
+    assert format_rate(1500) == "1.5K"
+    assert format_rate(10200) == "10K"
+    assert format_rate(5.55 * 1024 * 1024) == "5.5M"
+
+def test_first_sample_has_no_rate():
+    clock, tracker = make_tracker()
+    tick(clock, tracker, eth0=(1000, 2000))
+    assert tracker.totals() == (0.0, 0.0)
+
+def test_rate_per_second():
+    clock, tracker = make_tracker()
+    tick(clock, tracker, eth0=(0, 0))
+    clock.advance(1.0)  # two seconds between readings
+    tick(clock, tracker, eth0=(4000, 1000))
+    assert tracker.rates("eth0") == (2000.0, 500.0)
+
+def test_ewma_smoothing():
+    clock, tracker = make_tracker(alpha=0.5)
+    tick(clock, tracker, eth0=(0, 0))
+    tick(clock, tracker, eth0=(1000, 0))
+    tick(clock, tracker, eth0=(1000, 0))
+    assert tracker.rates("eth0") == (500.0, 0.0)
+
+def test_wrap_keeps_rate():
+    clock, tracker = make_tracker()
+    tick(clock, tracker, sda=(COUNTER_32 - 10, 0))
+    tick(clock, tracker, sda=(5, 0))
+    assert tracker.rates("sda") == (15.0, 0.0)
+
+def test_reset_reprimes_without_spike():
+    clock, tracker = make_tracker()
+    tick(clock, tracker, eth0=(6000000000, 0))
+    tick(clock, tracker, eth0=(6000100000, 100))
+    tick(clock, tracker, eth0=(1000, 200))
+    assert tracker.rates("eth0") == (0.0, 0.0)
+    tick(clock, tracker, eth0=(3000, 300))
+    assert tracker.rates("eth0") == (2000.0, 100.0)
+
+def test_vanished_names_are_dropped():
+    clock, tracker = make_tracker()
+    tick(clock, tracker, eth0=(0, 0), veth1=(0, 0))
+    tick(clock, tracker, eth0=(10, 10))
+    assert tracker.rates("veth1") == (0.0, 0.0)
+    assert len(tracker._entries) == 1
+
+def test_name_cache_forgets_missing_names():
+    calls = []
+    cache = NameCache(lambda name: calls.append(name) or name.startswith("eth"))
+    cache.begin()
+    assert cache("eth0") and not cache("veth1")
+    cache.end()
+    cache.begin()
+    assert cache("eth0")
+    cache.end()
+    assert len(cache) == 1
+    assert calls == ["eth0", "veth1"]
+
+def test_counter_source_scales_after_wrap(tmp_path):
+    path = tmp_path / "diskstats"
+    clock = VirtualClock()
+    source = CounterSource(str(path), PAIR_PATTERN, lambda name: name != b"loop0",
+                           scale=512, alpha=1.0, clock=clock)
+
+    path.write_bytes(b"sda %d 0\nloop0 0 0\n" % (COUNTER_32 - 10))
+    source.refresh()
+    clock.advance(1.0)
+    path.write_bytes(b"sda 5 0\nloop0 999 0\n")
+    source.refresh()
+
+    assert source.rates() == (15 * 512, 0)
+    assert source.rates("sda") == (15 * 512, 0)
+
+def test_counter_source_shared_read_once_per_interval(tmp_path):
+    path = tmp_path / "net"
+    path.write_bytes(b"eth0 0 0\n")
+    clock = VirtualClock()
+    source = CounterSource(str(path), PAIR_PATTERN, lambda name: True, alpha=1.0, clock=clock)
+    source.refresh()
+    clock.advance(1.0)
+    path.write_bytes(b"eth0 100 0\n")
+    source.refresh()
+    path.write_bytes(b"eth0 999999 0\n")
+    source.refresh()  # same tick: not re-read
+    assert source.rates("eth0") == (100.0, 0.0)
+
+def test_proc_file_reads_past_first_page(tmp_path):
+    # Map the same file page many times; the mappings cannot merge, so
+    # /proc/self/maps grows to several pages
+    path = tmp_path / "mapped-by-rpi-oled-test"
+    path.write_bytes(b"\0" * mmap.PAGESIZE)
+    maps = []
+    with open(path, "r+b") as f:
+        for _ in range(300):
+            maps.append(mmap.mmap(f.fileno(), mmap.PAGESIZE))
+    try:
+        proc = ProcFile("/proc/self/maps", size=1024)
+        size = proc.read()
+        assert size > 4096
+        matches = proc.finditer(re.compile(rb"mapped-by-rpi-oled-test$", re.MULTILINE))
+        assert len(list(matches)) >= 300
+        proc.close()
+    finally:
+        for mapped in maps:
+            mapped.close()
@@ -0,0 +1,44 @@
+"""
+Tests for trace recording in oled.trace.
+"""
+import os
+
+import pytest
+
+from oled.trace import TraceRecorder, read_trace
+
+def snapshot(now, cpu):
+    return {"time": now, "widgets": {"CPUWidget": {"value": cpu}, "RAMWidget": {"value": 40.0}}}
+
+def test_only_changed_states_are_recorded(tmp_path):
+    path = str(tmp_path / "trace")
+    recorder = TraceRecorder(path)
+    recorder.record(snapshot(100.0, 5.0))
+    recorder.record(snapshot(101.0, 7.0))
+    recorder.close()
+    assert list(read_trace(path)) == [
+        (100.0, {"CPUWidget": {"value": 5.0}, "RAMWidget": {"value": 40.0}}),
+        (101.0, {"CPUWidget": {"value": 7.0}}),
+    ]
+
+def test_rotation_starts_new_file_with_full_state(tmp_path):
+    path = str(tmp_path / "trace")
+    recorder = TraceRecorder(path, max_bytes=200, flush_every=1)
+    for tick in range(10):
+        recorder.record(snapshot(100.0 + tick, float(tick % 2)))
+    recorder.close()
+    assert os.path.getsize(path + ".1") >= 200
+    ticks = list(read_trace(path))
+    first_time, first_states = ticks[0]
+    assert first_states == {"CPUWidget": {"value": first_time % 2}, "RAMWidget": {"value": 40.0}}
+    assert ticks[-1][0] == 109.0
+
+def test_write_error_disables_recording(capsys):
+    if not os.path.exists("/dev/full"):
+        pytest.skip("needs /dev/full")
+    recorder = TraceRecorder("/dev/full", flush_every=1)
+    recorder.record(snapshot(100.0, 5.0))
+    recorder.record(snapshot(101.0, 7.0))
+    assert not recorder.enabled
+    assert capsys.readouterr().out.count("recording disabled") == 1
+    recorder.close()